@@ -1,6 +1,7 @@
 
 import warnings
 import os
+import logging
 
 import tkinter as tk
 from src.ui.main_window import ResumeGeneratorApp
@@ -8,6 +9,7 @@ from src.ui.main_window import ResumeGeneratorApp
 
 def main():
     """Main application entry point"""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
     root = tk.Tk()
     app = ResumeGeneratorApp(root)
     root.mainloop()
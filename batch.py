@@ -0,0 +1,50 @@
+"""Generate resumes in bulk without the GUI"""
+import argparse
+import json
+import logging
+
+from src.batch_runner import BatchRunner, read_records
+from src.client import GenerationClient
+from src.database import ResumeDatabase
+from src.layouts import LAYOUTS
+from src.tracing import tracer
+
+
+def main():
+    """Command-line entry point for batch generation"""
+    parser = argparse.ArgumentParser(description="Generate resumes in bulk")
+    parser.add_argument('source', help="input .jsonl or .csv file, or 'db' for the resumes table")
+    parser.add_argument('--out', default='batch_output', help="output folder (default: batch_output)")
+    parser.add_argument('--mode', choices=['template', 'ai'], default='template')
+    parser.add_argument('--layout', choices=sorted(LAYOUTS), help="text layout (default: LAYOUT_CONFIG['default'])")
+    parser.add_argument('--pdf', action='store_true', help="also export each resume to PDF")
+    parser.add_argument('--save-db', action='store_true', help="also save each resume to generated_resumes")
+    parser.add_argument('--db', default='resumes.db', help="database path (default: resumes.db)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes, or concurrent requests with --server (default: 1)")
+    parser.add_argument('--server', help="generate on a running generation server, e.g. http://127.0.0.1:8765")
+    parser.add_argument('--verbose', action='store_true', help="log what the engine is doing for every record")
+    parser.add_argument('--trace', action='store_true', help="print per-stage timings when done (in-process runs only)")
+    args = parser.parse_args()
+
+    # engine chatter is only useful when debugging, it slows bulk runs down
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING,
+                        format="%(levelname)s %(name)s: %(message)s")
+    if args.trace:
+        tracer.enable()
+
+    db = None
+    if args.source == 'db' or args.save_db:
+        db = ResumeDatabase(args.db)
+
+    engine = GenerationClient(args.server) if args.server else None
+    runner = BatchRunner(args.out, mode=args.mode, pdf=args.pdf, save_db=args.save_db, db=db,
+                         workers=args.workers, engine=engine, layout=args.layout)
+    runner.run(read_records(args.source, db))
+
+    if args.trace:
+        print(json.dumps(tracer.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
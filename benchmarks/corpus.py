@@ -0,0 +1,62 @@
+"""
+Synthetic resume corpora for benchmarks
+"""
+import random
+
+TITLES = [
+    "Software Developer", "Senior Backend Engineer", "Data Analyst", "Product Manager",
+    "UX Designer", "Team Lead", "Research Assistant", "Customer Support Specialist",
+    "DevOps Engineer", "Marketing Coordinator", "QA Engineer", "Project Manager",
+]
+COMPANIES = ["Tech Corp", "Acme Inc", "Globex", "Initech", "Umbrella Labs", "Stark Industries"]
+TECH_SKILLS = [
+    "Python", "JavaScript", "React", "SQL", "Git", "Docker", "Kubernetes", "AWS", "Java",
+    "C++", "Go", "Rust", "Tableau", "Excel", "Figma", "Linux", "TypeScript", "GraphQL",
+]
+SOFT_SKILLS = [
+    "Communication", "Leadership", "Teamwork", "Problem-solving", "Project Management",
+    "Analytical Thinking", "Creative Writing", "Collaboration",
+]
+BULLETS = [
+    "- Built internal tools used by the whole department",
+    "- Reduced report turnaround from days to hours",
+    "- Worked with stakeholders to define requirements",
+    "- Mentored two junior colleagues",
+    "- Migrated legacy services to the cloud",
+]
+
+# (name, jobs, skills) - from a fresh graduate up to a very long career
+SIZES = [
+    ('small', 2, 5),
+    ('medium', 6, 20),
+    ('large', 24, 80),
+    ('huge', 60, 400),
+]
+
+
+def make_record(jobs, skills, rng):
+    """One synthetic input record with the given number of jobs and skills"""
+    pool = TECH_SKILLS + SOFT_SKILLS
+    skill_list = [f"{rng.choice(pool)} {i}" if i >= len(pool) else pool[i] for i in range(skills)]
+    rng.shuffle(skill_list)
+
+    experience = []
+    for _ in range(jobs):
+        experience.append(rng.choice(TITLES))
+        experience.append(f"{rng.choice(COMPANIES)} | {rng.randint(2005, 2023)}")
+        experience.extend(rng.sample(BULLETS, 2))
+
+    return {
+        'name': f"Test Person {rng.randint(1, 99999)}",
+        'email': 'test@example.com',
+        'phone': '+1-234-567-8900',
+        'education': "BS Computer Science, State University, 2015\nMS Data Science, Tech Institute, 2018",
+        'skills': ', '.join(skill_list),
+        'experience': '\n'.join(experience),
+    }
+
+
+def make_corpus(jobs, skills, count, seed=0):
+    """A reproducible list of records of one size"""
+    rng = random.Random(seed)
+    return [make_record(jobs, skills, rng) for _ in range(count)]
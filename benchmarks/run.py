@@ -0,0 +1,420 @@
+"""
+Benchmark harness for ResumeEngine, PDF export and the database
+
+Runs offline: AI mode uses the 'fake' inference backend, so no weights
+are downloaded. The startup group profiles import time of the entry
+modules (see benchmarks/startup.py). Results are written as JSON so runs
+can be compared.
+
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --compare bench.json      # flag regressions
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# allow running as a plain script from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import SIZES, make_corpus  # noqa: E402
+from src.config import AI_CONFIG  # noqa: E402
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(fn, inputs):
+    """
+    Call fn once per input and summarize the timings
+
+    Returns:
+        dict: count, throughput and latency percentiles in milliseconds
+    """
+    timings = []
+    start = time.perf_counter()
+    for item in inputs:
+        t0 = time.perf_counter()
+        fn(item)
+        timings.append((time.perf_counter() - t0) * 1000.0)
+    total = time.perf_counter() - start
+
+    timings.sort()
+    return {
+        'count': len(timings),
+        'total_s': round(total, 4),
+        'per_second': round(len(timings) / total, 2) if total > 0 else 0.0,
+        'mean_ms': round(sum(timings) / len(timings), 4) if timings else 0.0,
+        'p50_ms': round(percentile(timings, 0.50), 4),
+        'p90_ms': round(percentile(timings, 0.90), 4),
+        'p99_ms': round(percentile(timings, 0.99), 4),
+        'max_ms': round(timings[-1], 4) if timings else 0.0,
+    }
+
+
+def bench_template(results, count):
+    from src.engine import ResumeEngine
+    from src.generation_cache import GenerationCache
+    from src.layouts import LAYOUTS
+    from src.resume_model import parse_fields
+
+    engine = ResumeEngine(cache=GenerationCache(db_path=None))
+
+    def cold(data):
+        # forget the previous generation so every section is rebuilt
+        engine.reset_sections()
+        engine.create_template_resume(data)
+
+    for size, jobs, skills in SIZES:
+        corpus = make_corpus(jobs, skills, count, seed=jobs)
+        results[f'template.create_resume.{size}'] = measure(cold, corpus)
+        results[f'template.regenerate_unchanged.{size}'] = measure(engine.create_template_resume, corpus[:1] * count)
+        # the formatters take the parsed resume; parsing is timed on its own
+        results[f'parse_resume.{size}'] = measure(
+            lambda d: parse_fields.__wrapped__(d['name'], d['email'], d['phone'], d['education'],
+                                               d['skills'], d['experience'], engine.skill_index),
+            corpus
+        )
+        parsed = [engine.parse_resume(d) for d in corpus]
+        results[f'format_skills.{size}'] = measure(lambda r: engine.format_skills(r.skills), parsed)
+        results[f'format_experience.{size}'] = measure(lambda r: engine.format_experience(r.experience), parsed)
+        results[f'format_education.{size}'] = measure(lambda r: engine.format_education(r.education), parsed)
+        results[f'generate_summary.{size}'] = measure(engine.generate_summary, parsed)
+        results[f'template_responsibilities.{size}'] = measure(
+            lambda r: engine.generate_template_responsibilities(r.experience.titles[0], r.skills), parsed
+        )
+
+    # rendering cost per layout, on the same medium corpus
+    corpus = make_corpus(6, 20, count, seed=6)
+    for name in sorted(LAYOUTS):
+        results[f'layout.{name}.medium'] = measure(
+            lambda d: engine.create_template_resume(d, layout=name), corpus
+        )
+
+
+def bench_skills(results, count):
+    import random
+    from src.skills import SOFT_KEYWORDS, SkillIndex
+
+    # a taxonomy the size of a real skills database
+    rng = random.Random(3)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    technical = [''.join(rng.choice(letters) for _ in range(rng.randint(4, 14))) for _ in range(5000)]
+    soft = SOFT_KEYWORDS + [''.join(rng.choice(letters) for _ in range(rng.randint(6, 16))) for _ in range(1000)]
+
+    for size, jobs, skills in SIZES:
+        corpus = make_corpus(jobs, skills, count, seed=jobs)
+        for label, keywords in (('builtin', None), ('taxonomy_6000', (soft, technical))):
+            # a fresh index each time so the parse cache doesn't hide the work
+            index = SkillIndex() if keywords is None else SkillIndex(*keywords)
+            results[f'skills.parse_uncached.{label}.{size}'] = measure(
+                lambda d: index.parse_uncached(d['skills']), corpus
+            )
+
+
+def bench_roles(results, count):
+    import random
+    from src.roles import DEFAULT_TAXONOMY, RoleIndex
+
+    rng = random.Random(5)
+    index = RoleIndex.from_file(DEFAULT_TAXONOMY)
+    roles = [role for family in json.load(open(DEFAULT_TAXONOMY, encoding='utf-8'))['families'].values()
+             for role in family['roles']]
+    prefixes = ['', 'Sr. ', 'Senior ', 'Jr. ', 'Lead ', 'Head of ', 'Principal ', 'Staff ']
+    suffixes = ['', ' II', ' (Remote)', ' - Contract', ' at Acme']
+    titles = [f"{rng.choice(prefixes)}{rng.choice(roles).title()}{rng.choice(suffixes)}" for _ in range(count * 500)]
+
+    # the target is 100k titles/second without the per-title memo
+    for label, match in (('uncached', index.match_uncached), ('memoized', index.match)):
+        start = time.perf_counter()
+        for title in titles:
+            match(title)
+        elapsed = time.perf_counter() - start
+        results[f'roles.match.{label}'] = {
+            'count': len(titles),
+            'total_s': round(elapsed, 4),
+            'per_second': round(len(titles) / elapsed, 2),
+            'mean_ms': round(1000.0 * elapsed / len(titles), 6),
+        }
+
+
+def bench_pdf(results, count, workdir):
+    # the exporter only imports reportlab on first export, so check for it here
+    if importlib.util.find_spec('reportlab') is None:
+        results['pdf.export'] = {'skipped': "reportlab is not installed"}
+        return
+
+    from src.pdf_exporter import PDFExporter
+    from src.engine import ResumeEngine
+
+    engine = ResumeEngine()
+    for size, jobs, skills in SIZES[:3]:
+        texts = [engine.create_template_resume(d) for d in make_corpus(jobs, skills, max(1, count // 10))]
+        path = os.path.join(workdir, 'bench.pdf')
+        results[f'pdf.export.{size}'] = measure(lambda text: PDFExporter.export(text, path), texts)
+
+
+def generated_texts(corpus):
+    """Template resumes for the corpus, realistic content for the generated_resumes table"""
+    from src.engine import ResumeEngine
+
+    engine = ResumeEngine()
+    return [engine.generate_resume(d, 'template') for d in corpus]
+
+
+def bench_database(results, count, workdir):
+    from src.database import ResumeDatabase
+
+    db = ResumeDatabase(os.path.join(workdir, 'bench.db'))
+    corpus = make_corpus(6, 20, count, seed=1)
+    texts = generated_texts(corpus)
+
+    ids = []
+    results['db.save_resume'] = measure(lambda d: ids.append(db.save_resume(d)), corpus)
+    results['db.load_resume'] = measure(db.load_resume, ids)
+    results['db.get_all_resumes'] = measure(lambda _: db.get_all_resumes(), range(20))
+    results['db.list_resumes_page'] = measure_pages(db, db.list_resumes)
+    queries = ['python', 'pyth', 'python initech', 'manager', 'leadership sql', 'nomatch'] * 10
+    results['db.search_resumes'] = measure(db.search_resumes, queries)
+
+    # a few dozen saves of one resume, then random revisions rebuilt
+    data = dict(corpus[0])
+    resume_id = db.save_resume(data)
+
+    def edit(i):
+        data['experience'] += f"\n- Shipped improvement {i}"
+        db.save_resume(data, resume_id)
+
+    results['db.save_resume_revision'] = measure(edit, range(50))
+    numbers = [number for number, _, _ in db.list_revisions(resume_id, 100)]
+    results['db.load_revision'] = measure(lambda n: db.load_revision(resume_id, n), numbers)
+    results['db.revision_diff'] = measure(lambda n: db.revision_diff(resume_id, n), numbers)
+
+    gen_ids = []
+    results['db.save_generated_resume'] = measure(
+        lambda i: gen_ids.append(db.save_generated_resume(f"Resume {i}", texts[i])), range(count)
+    )
+    results['db.load_generated_resume'] = measure(db.load_generated_resume, gen_ids)
+    results['db.get_all_generated_resumes'] = measure(lambda _: db.get_all_generated_resumes(), range(20))
+    results['db.list_generated_resumes_page'] = measure_pages(db, db.list_generated_resumes)
+    results['db.search_generated_resumes'] = measure(db.search_generated_resumes, ['resume', 'resu 1', 'nomatch'] * 20)
+    db.close()
+
+    bench_database_writes(results, texts, workdir)
+    bench_storage(results, corpus, texts, workdir)
+
+
+def measure_pages(db, list_page, page_size=20):
+    """Walk a listing page by page, the way the dropdowns do"""
+    state = {'after': None}
+
+    def next_page(_):
+        rows = list_page(page_size, state['after'])
+        state['after'] = db.page_cursor(rows[-1]) if len(rows) == page_size else None
+
+    return measure(next_page, range(20))
+
+
+def bench_database_writes(results, texts, workdir):
+    """Rows per second for single-row commits, batched commits and concurrent writers"""
+    from src.config import DATABASE_CONFIG
+    from src.database import ResumeDatabase
+
+    count = len(texts)
+    rows = [(f"Resume {i}", text, 'template') for i, text in enumerate(texts)]
+
+    def add_row_rate(name, stats, rows_written):
+        stats['rows_per_second'] = round(rows_written / stats['total_s'], 2) if stats['total_s'] > 0 else 0.0
+        results[name] = stats
+
+    # the old setup for reference: rollback journal, fsync on every commit
+    wal = DATABASE_CONFIG['wal']
+    DATABASE_CONFIG['wal'] = False
+    try:
+        db = ResumeDatabase(os.path.join(workdir, 'bench_journal.db'))
+        stats = measure(lambda row: db.save_generated_resume(*row), rows)
+        add_row_rate('db.write.single_rollback_journal', stats, count)
+        db.close()
+    finally:
+        DATABASE_CONFIG['wal'] = wal
+
+    db = ResumeDatabase(os.path.join(workdir, 'bench_writes.db'))
+    stats = measure(lambda row: db.save_generated_resume(*row), rows)
+    add_row_rate('db.write.single_wal', stats, count)
+
+    batch_size = 100
+    chunks = [rows[i:i + batch_size] for i in range(0, count, batch_size)]
+    stats = measure(lambda chunk: db.save_generated_resumes_many(chunk, batch_size), chunks)
+    add_row_rate('db.write.batched_wal', stats, count)
+
+    # several threads sharing one ResumeDatabase, each on its own connection
+    threads = 4
+
+    def write_concurrently(_):
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(lambda chunk: db.save_generated_resumes_many(chunk, batch_size), chunks))
+
+    stats = measure(write_concurrently, range(1))
+    add_row_rate(f'db.write.batched_wal_{threads}_threads', stats, count)
+    db.close()
+
+
+def bench_storage(results, corpus, texts, workdir):
+    """Disk use for several edited versions of every resume (no timings, not compared)"""
+    from src.database import ResumeDatabase
+
+    db = ResumeDatabase(os.path.join(workdir, 'bench_storage.db'))
+    rows = []
+    for version in range(4):
+        for data, text in zip(corpus, texts):
+            # a saved variant: same resume, one line changed
+            text = text.replace(data['name'].upper(), f"{data['name'].upper()} (v{version})", 1)
+            rows.append((f"{data['name']} (template)", text, 'template'))
+    db.save_generated_resumes_many(rows)
+    results['db.storage'] = db.storage_report()
+    db.close()
+
+
+def bench_ai(results, count, stub_delay_ms):
+    # stub model: canned output, optional fixed latency per generate call
+    AI_CONFIG['backend'] = 'fake'
+    AI_CONFIG['fake_delay'] = stub_delay_ms / 1000.0
+
+    from src.engine import ResumeEngine
+    from src.generation_cache import GenerationCache
+
+    engines = []
+
+    def load(_):
+        engine = ResumeEngine(cache=GenerationCache(db_path=None))
+        engine.load_ai_model()
+        engines.append(engine)
+
+    results['ai.model_load'] = measure(load, range(3))
+    engine = engines[-1]
+
+    corpus = [engine.parse_resume(d) for d in make_corpus(6, 20, count, seed=2)]
+    results['ai.summary_section'] = measure(engine.ai_generate_summary, corpus)
+    results['ai.job_section'] = measure(
+        lambda r: engine.ai_generate_job_responsibilities(r.experience.titles[0], r), corpus
+    )
+
+    def cold(data):
+        engine.reset_sections()
+        engine.create_ai_resume(data)
+
+    for size, jobs, skills in SIZES[:3]:
+        results[f'ai.create_resume.{size}'] = measure(cold, make_corpus(jobs, skills, max(1, count // 4), seed=jobs))
+
+
+def bench_startup(results, repeats=5):
+    from benchmarks.startup import ENTRY_MODULES, profile_import
+
+    for module in ENTRY_MODULES:
+        runs = [profile_import(module) for _ in range(repeats)]
+        if 'skipped' in runs[0]:
+            results[f'startup.{module}'] = runs[0]
+            continue
+        totals = sorted(run['total_ms'] for run in runs)
+        results[f'startup.{module}'] = {
+            'count': len(totals),
+            'p50_ms': percentile(totals, 0.50),
+            'p90_ms': percentile(totals, 0.90),
+            'max_ms': totals[-1],
+            'modules': runs[0]['modules'],
+            'deferred_loaded': runs[0]['deferred_loaded'],
+        }
+
+
+def compare(current, baseline, threshold):
+    """Return benchmarks whose median got slower than the threshold allows"""
+    regressions = []
+    for name, stats in current.items():
+        old = baseline.get(name)
+        if not old or 'p50_ms' not in stats or 'p50_ms' not in old or old['p50_ms'] <= 0:
+            continue
+        change = (stats['p50_ms'] - old['p50_ms']) / old['p50_ms']
+        if change > threshold:
+            regressions.append((name, old['p50_ms'], stats['p50_ms'], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume engine")
+    parser.add_argument('--count', type=int, default=200, help="records per benchmark")
+    parser.add_argument('--only', choices=['template', 'skills', 'roles', 'pdf', 'db', 'ai', 'startup'], action='append',
+                        help="run only some groups (repeatable)")
+    parser.add_argument('--stub-delay-ms', type=float, default=0.0,
+                        help="simulated latency of each stub model call")
+    parser.add_argument('--trace', action='store_true',
+                        help="also record per-stage engine timings (adds span overhead to the results)")
+    parser.add_argument('--output', help="write JSON results here (default: stdout)")
+    parser.add_argument('--compare', help="earlier JSON results to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed median slowdown before flagging (default: 0.25 = 25%%)")
+    args = parser.parse_args()
+
+    groups = args.only or ['template', 'skills', 'roles', 'pdf', 'db', 'ai', 'startup']
+    if args.trace:
+        from src.tracing import tracer
+        tracer.enable()
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        if 'template' in groups:
+            bench_template(results, args.count)
+        if 'skills' in groups:
+            bench_skills(results, args.count)
+        if 'roles' in groups:
+            bench_roles(results, args.count)
+        if 'pdf' in groups:
+            bench_pdf(results, args.count, workdir)
+        if 'db' in groups:
+            bench_database(results, args.count, workdir)
+        if 'ai' in groups:
+            bench_ai(results, args.count, args.stub_delay_ms)
+        if 'startup' in groups:
+            bench_startup(results)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'count': args.count,
+        },
+        'results': results,
+    }
+    if args.trace:
+        report['tracing'] = tracer.stats()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Wrote {len(results)} benchmark results to {args.output}")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new, change in regressions:
+            print(f"REGRESSION {name}: p50 {old:.3f}ms -> {new:.3f}ms (+{change:.0%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("No regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
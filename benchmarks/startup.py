@@ -0,0 +1,97 @@
+"""
+Import-time profile of the application's entry modules
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter
+and sums up the report, so cold start can be kept under a fixed budget.
+Heavy optional libraries must not show up at startup at all.
+
+    python benchmarks/startup.py                  # report, exit 1 over budget
+    python benchmarks/startup.py --budget-ms 150
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# what each entry point imports before it can do anything
+ENTRY_MODULES = ['src.ui.main_window', 'src.engine', 'src.batch_runner', 'src.server']
+
+# these belong to the first PDF export or the first AI use, never to startup
+DEFERRED = ['reportlab', 'torch', 'transformers', 'onnxruntime', 'optimum']
+
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output
+
+    Returns:
+        list: (module, self microseconds, cumulative microseconds)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        try:
+            rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+        except ValueError:
+            continue
+    return rows
+
+
+def profile_import(module, top=10):
+    """Import module in a clean interpreter and summarize where the time went"""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'import failed'
+        return {'skipped': error}
+
+    total = next((cumulative for name, _, cumulative in rows if name == module), 0)
+    names = set(name for name, _, _ in rows)
+    slowest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+    return {
+        'total_ms': round(total / 1000.0, 2),
+        'modules': len(rows),
+        'deferred_loaded': [name for name in DEFERRED if name in names],
+        'slowest_self_ms': [[name, round(us / 1000.0, 2)] for name, us, _ in slowest],
+    }
+
+
+def profile_all(modules=None):
+    return {module: profile_import(module) for module in (modules or ENTRY_MODULES)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile import time of the entry modules")
+    parser.add_argument('--budget-ms', type=float, default=250.0,
+                        help="fail if any entry module takes longer to import (default: 250)")
+    parser.add_argument('--module', action='append', help="profile only these modules (repeatable)")
+    args = parser.parse_args()
+
+    report = profile_all(args.module)
+    print(json.dumps(report, indent=2))
+
+    failed = False
+    for module, result in report.items():
+        if 'skipped' in result:
+            continue
+        if result['total_ms'] > args.budget_ms:
+            print(f"OVER BUDGET {module}: {result['total_ms']}ms > {args.budget_ms}ms", file=sys.stderr)
+            failed = True
+        if result['deferred_loaded']:
+            print(f"EAGER IMPORT {module}: {', '.join(result['deferred_loaded'])}", file=sys.stderr)
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
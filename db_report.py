@@ -0,0 +1,47 @@
+"""Report how much disk space generated resume storage saves"""
+import argparse
+import json
+import logging
+
+from src.database import ResumeDatabase
+
+
+def format_bytes(count):
+    for unit in ('B', 'KB', 'MB'):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024.0
+    return f"{count:.1f} GB"
+
+
+def main():
+    """Command-line entry point for the storage report"""
+    parser = argparse.ArgumentParser(description="Report generated resume storage savings")
+    parser.add_argument('--db', default='resumes.db', help="database path (default: resumes.db)")
+    parser.add_argument('--vacuum', action='store_true', help="compact the file first, e.g. after migrating")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    # opening the database migrates it if it still stores plain text
+    db = ResumeDatabase(args.db)
+    if args.vacuum:
+        db.vacuum()
+    report = db.storage_report()
+    db.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Generated resumes: {report['generated_resumes']}")
+    print(f"Unique bodies:     {report['unique_bodies']} ({report['delta_bodies']} stored as deltas)")
+    print(f"Text:              {format_bytes(report['text_bytes'])}")
+    print(f"Stored:            {format_bytes(report['stored_bytes'])} ({report['ratio']}x smaller)")
+    print(f"Saved:             {format_bytes(report['saved_bytes'])}")
+    print(f"Database file:     {format_bytes(report['file_bytes'])}")
+
+
+if __name__ == "__main__":
+    main()
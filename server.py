@@ -0,0 +1,49 @@
+"""Run the shared local generation server"""
+import argparse
+import logging
+
+from src.config import AI_CONFIG, SERVER_CONFIG
+
+
+def main():
+    """Command-line entry point for the generation server"""
+    parser = argparse.ArgumentParser(description="Serve resume generation over localhost HTTP")
+    parser.add_argument('--host', default=SERVER_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=SERVER_CONFIG['port'])
+    parser.add_argument('--window-ms', type=int, default=SERVER_CONFIG['window_ms'],
+                        help="how long to wait for concurrent requests to share a batch")
+    parser.add_argument('--fake-model', action='store_true',
+                        help="use canned AI output instead of downloading the model")
+    parser.add_argument('--trace', action='store_true',
+                        help="time each generation stage, totals are served on /stats")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.fake_model:
+        AI_CONFIG['backend'] = 'fake'
+
+    # imported after the backend is chosen, the engine reads AI_CONFIG on creation
+    from src.engine import ResumeEngine
+    from src.server import GenerationServer
+    from src.tracing import tracer
+
+    if args.trace:
+        tracer.enable()
+
+    engine = ResumeEngine()
+    server = GenerationServer(engine, args.host, args.port, args.window_ms)
+    if engine.ai_enabled:
+        engine.load_ai_model()
+
+    print(f"Generation server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Headless batch generation
+
+Reads resume records from JSONL, CSV or the resumes table, runs them
+through ResumeEngine and writes text, PDF and/or database outputs.
+A record counts as processed once its .txt file exists, so an
+interrupted run picks up where it stopped. Database rows are saved in
+batches, one transaction each, and a record's .txt is only written
+after its batch commits.
+"""
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.client import GenerationClient
+from src.config import DATABASE_CONFIG
+from src.engine import ResumeEngine
+from src.parallel import imap_resumes
+
+FIELDS = ['name', 'email', 'phone', 'education', 'skills', 'experience']
+
+
+def normalize_record(raw):
+    """Make sure every field the engine needs is a string"""
+    record = {}
+    for field in FIELDS:
+        value = raw.get(field)
+        record[field] = '' if value is None else str(value).strip()
+    return record
+
+
+def read_jsonl(path):
+    """Yield (record id, data) from a JSONL file"""
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            raw = json.loads(line)
+            yield str(raw.get('id', line_number)), normalize_record(raw)
+
+
+def read_csv(path):
+    """Yield (record id, data) from a CSV file with a header row"""
+    with open(path, encoding='utf-8', newline='') as f:
+        for row_number, raw in enumerate(csv.DictReader(f), start=1):
+            yield str(raw.get('id') or row_number), normalize_record(raw)
+
+
+def read_database(db):
+    """Yield (record id, data) for every saved resume"""
+    for row in db.iter_resumes():
+        data = db.load_resume(row[0])
+        if data:
+            yield str(data['id']), normalize_record(data)
+
+
+def read_records(source, db=None):
+    """Pick a reader based on the source: 'db', *.jsonl or *.csv"""
+    if source == 'db':
+        return read_database(db)
+    if source.endswith('.csv'):
+        return read_csv(source)
+    return read_jsonl(source)
+
+
+def safe_name(record_id):
+    """Turn a record id into something usable as a file name"""
+    return ''.join(c if c.isalnum() or c in '-_' else '_' for c in record_id)
+
+
+def write_text(path, text):
+    # write then rename so a half-written file never looks finished
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class BatchRunner:
+    """Generates resumes for many records without the GUI"""
+
+    def __init__(self, out_dir, mode='template', pdf=False, save_db=False,
+                 engine=None, db=None, report_every=100, workers=1, layout=None):
+        self.out_dir = out_dir
+        self.mode = mode
+        self.layout = layout
+        self.pdf = pdf
+        self.save_db = save_db
+        self.engine = engine or ResumeEngine()
+        self.db = db
+        self.report_every = report_every
+        self.workers = workers
+        # generated_resumes rows waiting to be written in one transaction,
+        # with the .txt path to write once they're saved
+        self.db_rows = []
+
+        self.generated = 0
+        self.skipped = 0
+        self.failed = 0
+
+        os.makedirs(out_dir, exist_ok=True)
+
+    def is_done(self, record_id):
+        return os.path.exists(os.path.join(self.out_dir, safe_name(record_id) + '.txt'))
+
+    def process(self, record_id, data):
+        """Generate and store one record"""
+        resume_text = self.engine.generate_resume(data, self.mode, layout=self.layout)
+        self.write_outputs(record_id, data, resume_text)
+
+    def write_outputs(self, record_id, data, resume_text):
+        """Store one generated resume, the .txt is written last"""
+        base = os.path.join(self.out_dir, safe_name(record_id))
+
+        if self.pdf:
+            # reportlab is only needed when PDFs are asked for
+            from src.pdf_exporter import PDFExporter
+            PDFExporter.export(resume_text, base + '.pdf')
+
+        if self.save_db:
+            title = f"{data['name']} ({self.mode})"
+            # flush before adding, so every buffered row is already counted
+            if len(self.db_rows) >= DATABASE_CONFIG['batch_size']:
+                self.flush_db()
+            self.db_rows.append((title, resume_text, self.mode, base + '.txt'))
+            return
+
+        write_text(base + '.txt', resume_text)
+
+    def flush_db(self):
+        """Save buffered rows in one transaction, then write their .txt files"""
+        rows, self.db_rows = self.db_rows, []
+        if not rows:
+            return
+        try:
+            self.db.save_generated_resumes_many([row[:3] for row in rows], batch_size=len(rows))
+        except Exception as e:
+            # nothing was written, so the next run redoes these records
+            print(f"Saving {len(rows)} resumes to the database failed: {str(e)}")
+            self.generated -= len(rows)
+            self.failed += len(rows)
+            return
+        for _, resume_text, _, path in rows:
+            write_text(path, resume_text)
+
+    def run(self, records):
+        """
+        Process every record, skipping ones that already have output
+
+        Returns:
+            dict: counts and throughput for the run
+        """
+        start = time.perf_counter()
+        if self.workers > 1:
+            self.run_parallel(records, start)
+        else:
+            self.run_serial(records, start)
+        self.flush_db()
+        return self.print_progress(start, final=True)
+
+    def pending(self, records):
+        """Drop records that are already done or can't be generated"""
+        for record_id, data in records:
+            if self.is_done(record_id):
+                self.skipped += 1
+                continue
+            if not data['name']:
+                print(f"Skipping record {record_id}: no name")
+                self.failed += 1
+                continue
+            yield record_id, data
+
+    def run_serial(self, records, start):
+        if self.mode == 'ai':
+            # load once up front rather than inside the first record
+            self.engine.load_ai_model()
+
+        for record_id, data in self.pending(records):
+            try:
+                self.process(record_id, data)
+            except Exception as e:
+                print(f"Record {record_id} failed: {str(e)}")
+                self.failed += 1
+                continue
+            self.record_success(start)
+
+    def run_parallel(self, records, start):
+        # read everything here, before the pool starts feeding workers
+        todo = list(self.pending(records))
+        if isinstance(self.engine, GenerationClient):
+            # the server batches concurrent requests, so keep several in flight
+            results = self.remote_results(todo)
+        else:
+            results = imap_resumes((data for _, data in todo), self.mode, self.workers, layout=self.layout)
+
+        # results come back in input order
+        for (record_id, data), (resume_text, error) in zip(todo, results):
+            try:
+                if error is not None:
+                    raise RuntimeError(error)
+                self.write_outputs(record_id, data, resume_text)
+            except Exception as e:
+                print(f"Record {record_id} failed: {str(e)}")
+                self.failed += 1
+                continue
+            self.record_success(start)
+
+    def remote_results(self, todo):
+        def generate(data):
+            try:
+                return self.engine.generate_resume(data, self.mode, layout=self.layout), None
+            except Exception as e:
+                return None, str(e)
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            yield from pool.map(generate, (data for _, data in todo))
+
+    def record_success(self, start):
+        self.generated += 1
+        if self.generated % self.report_every == 0:
+            self.print_progress(start)
+
+    def print_progress(self, start, final=False):
+        elapsed = time.perf_counter() - start
+        rate = self.generated / elapsed if elapsed > 0 else 0.0
+        stats = {
+            'generated': self.generated,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'seconds': round(elapsed, 2),
+            'resumes_per_second': round(rate, 2),
+        }
+        label = "Done" if final else "Progress"
+        print(f"{label}: {self.generated} generated, {self.skipped} skipped, "
+              f"{self.failed} failed in {elapsed:.1f}s ({rate:.1f} resumes/s)")
+        return stats
@@ -0,0 +1,64 @@
+"""
+Cancellation and deadlines for resume generation
+"""
+import threading
+import time
+
+
+class CancelToken:
+    """
+    Tells long-running generation when to stop
+
+    A token stops either when cancel() is called (from any thread) or
+    when its deadline passes. The deadline runs from creation, or with
+    start=False from the first start() call, so the engine can leave
+    model loading out of it. The engine checks it between model batches
+    and inside generation, then fills whatever is left from templates.
+    """
+
+    def __init__(self, timeout=None, start=True):
+        self.event = threading.Event()
+        self.timeout = timeout
+        self.deadline = None
+        if start:
+            self.start()
+
+    def start(self):
+        """Start the deadline clock, does nothing once it's running"""
+        if self.timeout and self.deadline is None:
+            self.deadline = time.monotonic() + self.timeout
+
+    def cancel(self):
+        self.event.set()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    @property
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def should_stop(self):
+        """True once the token is cancelled or out of time"""
+        return self.cancelled or self.expired
+
+    def remaining(self):
+        """Seconds left before the deadline, None if there is none"""
+        if self.deadline is None:
+            # a clock that hasn't started yet still has all of its time
+            return self.timeout or None
+        return max(0.0, self.deadline - time.monotonic())
+
+
+class TokenGroup:
+    """Stops only once every token in the group has stopped"""
+
+    def __init__(self, tokens):
+        self.tokens = list(tokens)
+
+    def should_stop(self):
+        # a request without a token never wants to stop
+        return bool(self.tokens) and all(
+            token is not None and token.should_stop() for token in self.tokens
+        )
@@ -0,0 +1,96 @@
+"""
+Thin client for the local generation server
+
+Has the same generation methods the GUI and batch tools use on
+ResumeEngine, so either can be handed a GenerationClient instead.
+"""
+import json
+import threading
+
+
+class GenerationClient:
+    """Talks to a running GenerationServer over HTTP"""
+
+    # remote generation always allows AI mode, the server decides what it can do
+    ai_enabled = True
+    backend_name = 'remote'
+
+    def __init__(self, url, timeout=300):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.local = threading.local()
+
+    @property
+    def last_fallbacks(self):
+        """AI sections the last generation on this thread filled from templates"""
+        return getattr(self.local, 'fallbacks', 0)
+
+    def request(self, path, payload=None, timeout=None):
+        """
+        Send one request to the server and decode its JSON answer
+
+        Raises:
+            RuntimeError: when the server answers with an error status
+        """
+        # urllib pulls in ssl and friends, only pay for it when a server is used
+        import urllib.error
+        import urllib.request
+
+        body = None
+        headers = {}
+        if payload is not None:
+            body = json.dumps(payload).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+
+        req = urllib.request.Request(self.url + path, data=body, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout or self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            # the server explains 4xx/5xx answers in a JSON body
+            try:
+                message = json.loads(e.read())['error']
+            except Exception:
+                message = e.reason
+            raise RuntimeError(f"Generation server error ({e.code}): {message}") from None
+
+    def health(self):
+        try:
+            return self.request('/health', timeout=5)
+        except Exception:
+            return None
+
+    @property
+    def model_loaded(self):
+        status = self.health()
+        return bool(status and status.get('model_loaded'))
+
+    def load_ai_model(self, progress=None):
+        """The server owns the model, just check it's reachable"""
+        return self.health() is not None
+
+    def warm_up(self, progress=None):
+        if progress:
+            progress("Connecting to generation server...")
+        return self.load_ai_model(progress)
+
+    def generate_resume(self, data, mode='template', cancel_token=None, layout=None):
+        """Generate on the server, the token's deadline is passed along"""
+        payload = {'data': data, 'mode': mode}
+        if layout:
+            payload['layout'] = layout
+        timeout = None
+        if cancel_token is not None and cancel_token.remaining() is not None:
+            payload['timeout'] = cancel_token.remaining()
+            # leave the server time to fill the rest from templates
+            timeout = payload['timeout'] + 30
+
+        result = self.request('/generate', payload, timeout)
+        self.local.fallbacks = result.get('fallbacks', 0)
+        return result['resume']
+
+    def stream_resume(self, data, mode='template', progress=None, cancel_token=None, layout=None):
+        """The server answers in one piece, so this yields a single chunk"""
+        if progress:
+            progress("Waiting for generation server...")
+        yield self.generate_resume(data, mode, cancel_token, layout)
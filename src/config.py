@@ -28,9 +28,68 @@ WINDOW_CONFIG = {
 
 # AI Model Configuration
 AI_CONFIG = {
-    'model_name': 'facebook/bart-large-cnn',
+    'model_name': 'google/flan-t5-base',
+    'backend': 'torch_int8',    # 'torch' (fp32), 'torch_int8' (dynamic quantization) or 'onnx'
+    'num_threads': None,        # torch/onnxruntime CPU threads, None keeps the default
+    'onnx_dir': 'onnx_model',   # where the ONNX export is kept
     'max_input_length': 512,
     'max_output_length': 150,
     'temperature': 0.7,
+    'warmup_on_startup': True,  # start loading the model in the background at launch
+    'max_batch_size': 8,        # prompts per generate call, cancellation is checked between calls
+    'max_wait_ms': 10,          # how long the scheduler waits for more prompts to fill a batch
+    'deadline_seconds': 60,     # latency budget for AI sections, the rest falls back to templates
 }
 
+
+# Generation Cache Configuration
+CACHE_CONFIG = {
+    'max_entries': 512,                 # in-memory LRU size
+    'db_path': 'generation_cache.db',   # on-disk tier next to resumes.db, None to disable
+    'deterministic': False,             # greedy decoding so outputs are reproducible
+    'reuse_sampled': False,             # reuse sampled outputs too
+}
+
+# Generation Server Configuration
+SERVER_CONFIG = {
+    'url': None,            # e.g. 'http://127.0.0.1:8765' to use a running server from the GUI
+    'host': '127.0.0.1',
+    'port': 8765,
+    'window_ms': 20,        # scheduler wait on the server, longer so concurrent requests share batches
+}
+
+# Database Configuration
+DATABASE_CONFIG = {
+    'wal': True,                # write-ahead log: readers don't block the writer and vice versa
+    'busy_timeout_ms': 5000,    # how long a writer waits for another process's lock
+    'synchronous': 'NORMAL',    # fsync at checkpoints rather than every commit (safe with WAL)
+    'batch_size': 500,          # rows per transaction in save_generated_resumes_many
+    'page_size': 50,            # rows per page in list_resumes / list_generated_resumes and the dropdowns
+    'compression_level': 6,     # zlib level for generated resume text
+    'delta_compression': True,  # store new versions as deltas against an earlier one when smaller
+    'snapshot_every': 10,       # resume revisions: a full snapshot every N, patches in between
+}
+
+# Layout Configuration
+LAYOUT_CONFIG = {
+    'default': 'classic',   # 'classic', 'compact' or 'two_column' (see src/layouts.py)
+    'layouts_path': None,   # JSON file with extra layout specs, loaded at startup
+}
+
+# Skills Configuration
+SKILLS_CONFIG = {
+    'taxonomy_path': None,  # JSON file with extra "soft" and "technical" skill terms
+    'cache_size': 1024,     # distinct skills fields kept parsed
+}
+
+# Role Taxonomy Configuration
+ROLES_CONFIG = {
+    'taxonomy_path': None,  # JSON role taxonomy, None uses src/data/roles.json
+    'cache_size': 4096,     # distinct job titles kept classified
+}
+
+# Tracing Configuration
+TRACE_CONFIG = {
+    'enabled': False,       # time each generation stage (see src/tracing.py)
+    'log_spans': True,      # log every span at DEBUG level when tracing is enabled
+}
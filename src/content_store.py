@@ -0,0 +1,49 @@
+"""
+Compressed, content-addressed resume text
+
+Generated resumes are stored by the SHA-256 of their text, so a body
+saved twice is kept once. Bodies are zlib-compressed, either on their
+own or as a delta: zlib primed with an earlier version of the same
+resume as its dictionary, so a variant that changes a few lines costs a
+few dozen bytes. A delta is always taken against a full body, so
+decoding never needs more than two blobs.
+"""
+import hashlib
+import zlib
+
+FULL = 'zlib'           # data is the compressed text
+DELTA = 'zlib-delta'    # data is the text compressed against a base body
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def compress(text, base_text=None, level=6):
+    """Compress text, against base_text when given (see DELTA)"""
+    raw = text.encode('utf-8')
+    if base_text is None:
+        return zlib.compress(raw, level)
+    # zlib only looks back 32KB, longer bases just compress less well
+    compressor = zlib.compressobj(level, zdict=base_text.encode('utf-8'))
+    return compressor.compress(raw) + compressor.flush()
+
+
+def decompress(codec, data, base_data=None):
+    """
+    Text of a stored body
+
+    Args:
+        codec: FULL or DELTA
+        data: the stored blob
+        base_data: the stored blob of the base body, for DELTA
+
+    Raises:
+        ValueError: for an unknown codec
+    """
+    if codec == FULL:
+        return zlib.decompress(data).decode('utf-8')
+    if codec == DELTA:
+        decompressor = zlib.decompressobj(zdict=zlib.decompress(base_data))
+        return (decompressor.decompress(data) + decompressor.flush()).decode('utf-8')
+    raise ValueError(f"Unknown content codec '{codec}'")
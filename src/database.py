@@ -1,12 +1,156 @@
+"""
+SQLite storage for resume inputs and generated resumes
+
+Every thread gets its own connection (sqlite3 connections can't be
+shared between threads), opened on first use. Connections run in WAL
+mode with a busy timeout, so the UI's worker threads, a batch job and
+other app instances can use the same resumes.db: readers never block
+the writer, and a writer waits for the lock instead of failing.
+
+Listings are keyset-paginated on indexed timestamps: a page is read
+straight off the index from where the previous one stopped, so the cost
+doesn't grow with the number of rows or how far down the list you are.
+
+Both tables are mirrored into FTS5 full-text indexes, so searching by
+skill or employer never reads content blobs. Triggers keep the resumes
+index current; the generated resumes index is filled from Python as rows
+are saved (see below). Without FTS5 in the local SQLite build, search
+falls back to matching names and titles.
+
+Generated resume text lives in content_blobs, compressed and keyed by
+hash (see src/content_store.py); generated_resumes rows point at it.
+Each connection registers resume_content(codec, data, base_data) so the
+app's queries can read the text back. Nothing stored in the schema uses
+it, so other sqlite clients can still read and write the file.
+
+A resumes row is the latest version of a resume; every save also adds a
+revision to resume_revisions, stored as a patch against the previous
+one with a full snapshot every DATABASE_CONFIG['snapshot_every']
+revisions (see src/revisions.py).
+"""
+import logging
+import re
 import sqlite3
+import threading
 from datetime import datetime
 
+from src.config import DATABASE_CONFIG
+from src.content_store import FULL, DELTA, content_hash, compress, decompress
+from src import revisions
+
+logger = logging.getLogger(__name__)
+
+# indexed columns per table, best match first: bm25 weights follow this order
+SEARCH_COLUMNS = {
+    'resumes': ('name', 'skills', 'experience', 'education'),
+    'generated_resumes': ('title', 'content'),
+}
+SEARCH_WEIGHTS = {
+    'resumes': (10.0, 5.0, 2.0, 1.0),
+    'generated_resumes': (5.0, 1.0),
+}
+
+# text of a generated resume body, from its row ({row}.content_hash)
+BODY_SQL = '''(
+    SELECT resume_content(b.codec, b.data, base.data)
+    FROM content_blobs b LEFT JOIN content_blobs base ON base.hash = b.base_hash
+    WHERE b.hash = {row}.content_hash
+)'''
+# tables whose index keeps no copy of the text and is written from Python:
+# a trigger would need resume_content(), which only our connections have
+CONTENTLESS_SEARCH = ('generated_resumes',)
+
+WORD_RE = re.compile(r"\w+")
+
+
+def fts_query(text, prefix=True):
+    """
+    Turn free text into an FTS5 query: every word must match
+
+    Words are quoted so FTS5 operators in the input are taken literally;
+    with prefix, each word also matches longer words ("pyth" -> "python").
+    """
+    words = WORD_RE.findall(text)
+    if not words:
+        return None
+    star = '*' if prefix else ''
+    return ' '.join(f'"{word}"{star}' for word in words)
+
+
+def text_snippet(text, query, prefix=True, size=8):
+    """
+    About what FTS5's snippet() gives, for indexes that keep no text
+
+    Returns:
+        str: up to size words from around the first match, matches
+        wrapped in [ ] and cut ends marked with …
+    """
+    words = [word.lower() for word in WORD_RE.findall(query)]
+    tokens = list(WORD_RE.finditer(text))
+    if not tokens:
+        return ''
+
+    def matches(token):
+        value = token.group().lower()
+        return any(value.startswith(word) if prefix else value == word for word in words)
+
+    first = next((i for i, token in enumerate(tokens) if matches(token)), 0)
+    start = max(0, min(first - size // 4, len(tokens) - size))
+    window = tokens[start:start + size]
+
+    parts = []
+    position = window[0].start()
+    for token in window:
+        parts.append(text[position:token.start()])
+        parts.append(f"[{token.group()}]" if matches(token) else token.group())
+        position = token.end()
+    snippet = ''.join(parts)
+    if start > 0:
+        snippet = '…' + snippet
+    if start + size < len(tokens):
+        snippet += '…'
+    return snippet
+
 
 class ResumeDatabase:
     def __init__(self, db_path="resumes.db"):
-        self.conn = sqlite3.connect(db_path)
+        self.db_path = db_path
+        self.local = threading.local()
+        self.connections = []
+        self.connections_lock = threading.Lock()
         self.setup_tables()
 
+    @property
+    def conn(self):
+        """This thread's connection"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.connect()
+            self.local.conn = conn
+            with self.connections_lock:
+                self.connections.append(conn)
+        return conn
+
+    def connect(self):
+        timeout_ms = DATABASE_CONFIG['busy_timeout_ms']
+        # check_same_thread=False only so close() can run from any thread,
+        # each connection is still used by the thread that opened it
+        conn = sqlite3.connect(self.db_path, timeout=timeout_ms / 1000.0, check_same_thread=False)
+        conn.execute(f'PRAGMA busy_timeout = {int(timeout_ms)}')
+        if DATABASE_CONFIG['wal']:
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute(f"PRAGMA synchronous = {DATABASE_CONFIG['synchronous']}")
+        conn.create_function('resume_content', 3, decompress, deterministic=True)
+        return conn
+
+    def close(self):
+        """Close every thread's connection, the next call reconnects"""
+        with self.connections_lock:
+            connections, self.connections = self.connections, []
+        for conn in connections:
+            conn.close()
+        self.local = threading.local()
+
     def setup_tables(self):
         cursor = self.conn.cursor()
 
@@ -25,29 +169,482 @@ class ResumeDatabase:
             )
         ''')
 
+        # every saved version of a resume, newest is the resumes row itself
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS resume_revisions (
+                id INTEGER PRIMARY KEY,
+                resume_id INTEGER NOT NULL REFERENCES resumes (id),
+                number INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                data BLOB NOT NULL,
+                created_at TEXT,
+                UNIQUE (resume_id, number)
+            )
+        ''')
+
+        # each distinct generated resume body, compressed
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS content_blobs (
+                hash TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                base_hash TEXT,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL
+            )
+        ''')
+
         # table for generated resume outputs
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS generated_resumes (
                 id INTEGER PRIMARY KEY,
                 title TEXT NOT NULL,
-                content TEXT NOT NULL,
+                content_hash TEXT NOT NULL REFERENCES content_blobs (hash),
                 mode TEXT,
                 created_at TEXT
             )
         ''')
+        self.migrate_generated_content(cursor)
+
+        # listings are ordered newest first; the rowid is implicitly part of
+        # each index, which breaks ties between equal timestamps
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_updated_at ON resumes (updated_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_generated_resumes_created_at ON generated_resumes (created_at)')
+        # finds the previous version of a resume to store a delta against
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_generated_resumes_title ON generated_resumes (title)')
+
+        self.fts_enabled = self.setup_search(cursor)
 
         self.conn.commit()
 
-    def save_resume(self, data):
-        cursor = self.conn.cursor()
-        now = datetime.now().isoformat()
+    def setup_search(self, cursor):
+        """Create the FTS5 mirrors and their triggers, False when FTS5 isn't available"""
+        self.drop_app_only_schema(cursor)
+
+        for table, columns in SEARCH_COLUMNS.items():
+            fts = f'{table}_fts'
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+            ).fetchone()
+            if exists:
+                continue
+
+            column_list = ', '.join(columns)
+            # external content: the index points at the table's rows, no second copy.
+            # contentless: only the index, the text stays compressed in content_blobs
+            if table in CONTENTLESS_SEARCH:
+                content = "content=''"
+            else:
+                content = f"content='{table}', content_rowid='id'"
+            try:
+                # prefix indexes make short "pyth*" style queries cheap
+                cursor.execute(f'''
+                    CREATE VIRTUAL TABLE {fts} USING fts5(
+                        {column_list}, {content},
+                        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                    )
+                ''')
+            except sqlite3.OperationalError as e:
+                logger.warning("Full-text search unavailable, falling back to name/title matching: %s", e)
+                return False
+
+            if table in CONTENTLESS_SEARCH:
+                # index rows saved before search existed, new ones are added on save
+                cursor.execute(f'''
+                    INSERT INTO {fts} (rowid, title, content)
+                    SELECT g.id, g.title, {BODY_SQL.format(row='g')} FROM {table} g
+                ''')
+                continue
+
+            new_values = ', '.join(f'new.{c}' for c in columns)
+            old_values = ', '.join(f'old.{c}' for c in columns)
+
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values});
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE ON {table} BEGIN
+                    INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                    INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values});
+                END
+            ''')
+            # index rows saved before search existed
+            cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+        return True
+
+    def drop_app_only_schema(self, cursor):
+        """
+        Remove the view and search triggers that called resume_content()
+
+        Databases written before generated resumes were indexed from
+        Python had them, and any other sqlite client failed to write
+        generated_resumes. Their index is rebuilt by setup_search.
+        """
+        cursor.execute('DROP VIEW IF EXISTS generated_resumes_text')
+        row = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'generated_resumes_fts'"
+        ).fetchone()
+        if row is None or "content=''" in row[0]:
+            return
+        logger.info("Rebuilding the generated resume search index")
+        for trigger in ('insert', 'delete', 'update'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS generated_resumes_fts_{trigger}')
+        cursor.execute('DROP TABLE generated_resumes_fts')
+
+    def ensure_first_revision(self, cursor, resume_id):
+        """
+        Give a resume saved before revisions existed its first revision
+
+        Done on first use rather than for every old resume when the
+        database is opened, which would compress each one up front.
+        """
+        if cursor.execute('SELECT 1 FROM resume_revisions WHERE resume_id = ? LIMIT 1', (resume_id,)).fetchone():
+            return
+        row = cursor.execute(
+            'SELECT name, email, phone, education, skills, experience, updated_at FROM resumes WHERE id = ?',
+            (resume_id,)
+        ).fetchone()
+        if row is not None:
+            fields = revisions.field_data(dict(zip(revisions.FIELDS, row)))
+            self.add_revision(cursor, resume_id, None, fields, row[6])
+
+    def add_revision(self, cursor, resume_id, previous, fields, now):
+        """Store fields as the next revision, a patch against previous unless it's time for a snapshot"""
+        last = cursor.execute(
+            'SELECT MAX(number) FROM resume_revisions WHERE resume_id = ?', (resume_id,)
+        ).fetchone()[0]
+        number = (last or 0) + 1
+        if previous is None or (number - 1) % DATABASE_CONFIG['snapshot_every'] == 0:
+            kind, data = revisions.SNAPSHOT, revisions.encode(fields)
+        else:
+            kind, data = revisions.PATCH, revisions.encode(revisions.make_patch(previous, fields))
         cursor.execute('''
-            INSERT INTO resumes (name, email, phone, education, skills, experience, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (data['name'], data['email'], data['phone'],
-              data['education'], data['skills'], data['experience'], now, now))
-        self.conn.commit()
-        return cursor.lastrowid
+            INSERT INTO resume_revisions (resume_id, number, kind, data, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (resume_id, number, kind, data, now))
+        return number
+
+    def migrate_generated_content(self, cursor):
+        """Move text out of the old generated_resumes.content column into content_blobs"""
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(generated_resumes)')]
+        if 'content' not in columns:
+            return
+
+        logger.info("Moving generated resume text into compressed storage")
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # the old search index reads the content column, setup_search rebuilds it
+            for trigger in ('insert', 'delete', 'update'):
+                conn.execute(f'DROP TRIGGER IF EXISTS generated_resumes_fts_{trigger}')
+            conn.execute('DROP TABLE IF EXISTS generated_resumes_fts')
+
+            conn.execute('''
+                CREATE TABLE generated_resumes_new (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    content_hash TEXT NOT NULL REFERENCES content_blobs (hash),
+                    mode TEXT,
+                    created_at TEXT
+                )
+            ''')
+            conn.execute('CREATE INDEX idx_generated_resumes_title ON generated_resumes_new (title)')
+
+            # oldest first, so each version can be stored against the one before it
+            write = conn.cursor()
+            rows = conn.execute('SELECT id, title, content, mode, created_at FROM generated_resumes ORDER BY id')
+            for resume_id, title, content, mode, created_at in rows:
+                key = self.store_content(write, content, title, table='generated_resumes_new')
+                write.execute('''
+                    INSERT INTO generated_resumes_new (id, title, content_hash, mode, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (resume_id, title, key, mode, created_at))
+
+            conn.execute('DROP TABLE generated_resumes')
+            conn.execute('ALTER TABLE generated_resumes_new RENAME TO generated_resumes')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def store_content(self, cursor, text, title, table='generated_resumes'):
+        """
+        Store a generated resume body unless it's already there
+
+        With DATABASE_CONFIG['delta_compression'], the body is stored as a
+        delta against the last version with the same title (or the last
+        resume saved) when that comes out smaller.
+
+        Returns:
+            str: the body's hash, for generated_resumes.content_hash
+        """
+        key = content_hash(text)
+        if cursor.execute('SELECT 1 FROM content_blobs WHERE hash = ?', (key,)).fetchone():
+            return key
+
+        level = DATABASE_CONFIG['compression_level']
+        data = compress(text, level=level)
+        codec = FULL
+        base_hash = None
+        if DATABASE_CONFIG['delta_compression']:
+            base = self.delta_base(cursor, title, table)
+            if base is not None:
+                delta = compress(text, base[1], level)
+                if len(delta) < len(data):
+                    data, codec, base_hash = delta, DELTA, base[0]
+
+        cursor.execute('''
+            INSERT INTO content_blobs (hash, codec, base_hash, data, size, stored_size)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (key, codec, base_hash, data, len(text.encode('utf-8')), len(data)))
+        return key
+
+    def delta_base(self, cursor, title, table):
+        """(hash, text) of the full body a new version of title should be stored against"""
+        select = f'SELECT b.hash, b.codec, b.base_hash FROM {table} g JOIN content_blobs b ON b.hash = g.content_hash'
+        row = cursor.execute(select + ' WHERE g.title = ? ORDER BY g.id DESC LIMIT 1', (title,)).fetchone()
+        if row is None:
+            row = cursor.execute(select + ' ORDER BY g.id DESC LIMIT 1').fetchone()
+        if row is None:
+            return None
+
+        # deltas only ever point at full bodies, so a load reads at most two blobs
+        base_hash = row[0] if row[1] == FULL else row[2]
+        cached = getattr(self.local, 'base', None)
+        if cached is not None and cached[0] == base_hash:
+            return cached
+        codec, data = cursor.execute('SELECT codec, data FROM content_blobs WHERE hash = ?', (base_hash,)).fetchone()
+        self.local.base = (base_hash, decompress(codec, data))
+        return self.local.base
+
+    def storage_report(self):
+        """
+        How much space generated resume storage takes and saves
+
+        Returns:
+            dict: row and body counts, text_bytes (the text of every row, what
+            plain storage would hold), stored_bytes (compressed unique bodies),
+            saved_bytes, ratio and the database file size
+        """
+        conn = self.conn
+        rows, text_bytes = conn.execute('''
+            SELECT COUNT(*), COALESCE(SUM(b.size), 0)
+            FROM generated_resumes g JOIN content_blobs b ON b.hash = g.content_hash
+        ''').fetchone()
+        bodies, deltas, stored_bytes = conn.execute(f'''
+            SELECT COUNT(*), COALESCE(SUM(codec = '{DELTA}'), 0), COALESCE(SUM(stored_size), 0)
+            FROM content_blobs
+        ''').fetchone()
+        page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        return {
+            'generated_resumes': rows,
+            'unique_bodies': bodies,
+            'delta_bodies': deltas,
+            'text_bytes': text_bytes,
+            'stored_bytes': stored_bytes,
+            'saved_bytes': text_bytes - stored_bytes,
+            'ratio': round(text_bytes / stored_bytes, 2) if stored_bytes else 0.0,
+            'file_bytes': page_count * page_size,
+        }
+
+    def vacuum(self):
+        """Rewrite the file to give space freed by the migration back to the disk"""
+        self.conn.execute('VACUUM')
+
+    def search(self, table, label, timestamp, query, limit, prefix):
+        limit = limit or DATABASE_CONFIG['page_size']
+        if not self.fts_enabled:
+            return [row + ('',) for row in self.list_page(table, label, timestamp, limit, None, query)]
+
+        match = fts_query(query, prefix)
+        if match is None:
+            return []
+        fts = f'{table}_fts'
+        weights = ', '.join(str(w) for w in SEARCH_WEIGHTS[table])
+        # rank every match, but only cut snippets for the rows returned
+        ranked = f'''
+            SELECT rowid AS id, bm25({fts}, {weights}) AS score
+            FROM {fts} WHERE {fts} MATCH ?
+            ORDER BY score LIMIT ?
+        '''
+        if table in CONTENTLESS_SEARCH:
+            rows = self.conn.execute(f'''
+                SELECT t.id, t.{label}, t.{timestamp} FROM ({ranked}) m
+                JOIN {table} t ON t.id = m.id
+                ORDER BY m.score
+            ''', (match, limit)).fetchall()
+            # the index has no text to cut a snippet from, read just these rows
+            texts = self.generated_texts([row[0] for row in rows])
+            return [row + (text_snippet(texts.get(row[0], ''), query, prefix),) for row in rows]
+
+        rows = self.conn.execute(f'''
+            SELECT t.id, t.{label}, t.{timestamp}, snippet({fts}, -1, '[', ']', '…', 8) FROM ({ranked}) m
+            JOIN {table} t ON t.id = m.id
+            JOIN {fts} ON {fts}.rowid = m.id AND {fts} MATCH ?
+            ORDER BY m.score
+        ''', (match, limit, match))
+        return rows.fetchall()
+
+    def generated_texts(self, ids):
+        """{id: text} for generated resume ids"""
+        if not ids:
+            return {}
+        marks = ', '.join('?' * len(ids))
+        rows = self.conn.execute(
+            f'SELECT g.id, {BODY_SQL.format(row="g")} FROM generated_resumes g WHERE g.id IN ({marks})', ids
+        )
+        return dict(rows.fetchall())
+
+    def list_page(self, table, label, timestamp, limit, after, text):
+        sql = f'SELECT id, {label}, {timestamp} FROM {table}'
+        clauses = []
+        params = []
+        if after is not None:
+            clauses.append(f'({timestamp}, id) < (?, ?)')
+            params.extend(after)
+        if text:
+            escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append(f"{label} LIKE ? ESCAPE '\\'")
+            params.append(f'%{escaped}%')
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += f' ORDER BY {timestamp} DESC, id DESC LIMIT ?'
+        params.append(limit or DATABASE_CONFIG['page_size'])
+        return self.conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def page_cursor(row):
+        """The `after` value for the page following the one ending in row"""
+        return (row[2], row[0])
+
+    def save_resume(self, data, resume_id=None):
+        """
+        Save a resume, or a new revision of a saved one
+
+        Args:
+            data: dict with name, email, phone, education, skills, experience
+            resume_id: the resume this is an edit of, None for a new resume
+
+        Returns:
+            int: the resume id
+
+        Raises:
+            ValueError: when resume_id doesn't exist
+        """
+        conn = self.conn
+        cursor = conn.cursor()
+        now = datetime.now().isoformat()
+        fields = revisions.field_data(data)
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if resume_id is None:
+                cursor.execute('''
+                    INSERT INTO resumes (name, email, phone, education, skills, experience, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (data['name'], data['email'], data['phone'],
+                      data['education'], data['skills'], data['experience'], now, now))
+                resume_id = cursor.lastrowid
+                self.add_revision(cursor, resume_id, None, fields, now)
+            else:
+                current = self.load_resume(resume_id)
+                if current is None:
+                    raise ValueError(f"No saved resume #{resume_id}")
+                previous = revisions.field_data(current)
+                # saving without changes doesn't make a revision
+                if previous != fields:
+                    self.ensure_first_revision(cursor, resume_id)
+                    cursor.execute('''
+                        UPDATE resumes
+                        SET name = ?, email = ?, phone = ?, education = ?, skills = ?, experience = ?, updated_at = ?
+                        WHERE id = ?
+                    ''', (data['name'], data['email'], data['phone'],
+                          data['education'], data['skills'], data['experience'], now, resume_id))
+                    self.add_revision(cursor, resume_id, previous, fields, now)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return resume_id
+
+    def list_revisions(self, resume_id, limit=None, before=None):
+        """
+        Revision list of a resume, newest first, without their contents
+
+        Args:
+            limit: rows per page, DATABASE_CONFIG['page_size'] by default
+            before: the last revision number of the previous page, None for the first page
+
+        Returns:
+            list: (number, kind, created_at) rows
+        """
+        conn = self.conn
+        # resumes saved before revisions existed get their first one here
+        exists = 'SELECT 1 FROM resume_revisions WHERE resume_id = ? LIMIT 1'
+        if before is None and not conn.execute(exists, (resume_id,)).fetchone():
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                self.ensure_first_revision(conn.cursor(), resume_id)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        sql = 'SELECT number, kind, created_at FROM resume_revisions WHERE resume_id = ?'
+        params = [resume_id]
+        if before is not None:
+            sql += ' AND number < ?'
+            params.append(before)
+        sql += ' ORDER BY number DESC LIMIT ?'
+        params.append(limit or DATABASE_CONFIG['page_size'])
+        return conn.execute(sql, params).fetchall()
+
+    def load_revision(self, resume_id, number):
+        """
+        A resume as it was at one revision
+
+        Reads the closest snapshot at or before number and the patches
+        after it, at most DATABASE_CONFIG['snapshot_every'] rows.
+
+        Returns:
+            dict: the resume fields plus id and revision, None if there's no such revision
+        """
+        rows = self.conn.execute('''
+            SELECT number, kind, data FROM resume_revisions
+            WHERE resume_id = ? AND number <= ? AND number >= (
+                SELECT MAX(number) FROM resume_revisions
+                WHERE resume_id = ? AND number <= ? AND kind = ?
+            )
+            ORDER BY number
+        ''', (resume_id, number, resume_id, number, revisions.SNAPSHOT)).fetchall()
+        if not rows or rows[-1][0] != number:
+            return None
+
+        fields = revisions.decode(rows[0][2])
+        for _, _, data in rows[1:]:
+            fields = revisions.apply_patch(fields, revisions.decode(data))
+        fields['id'] = resume_id
+        fields['revision'] = number
+        return fields
+
+    def revision_diff(self, resume_id, number):
+        """Unified diff of what changed in a revision, None if there's no such revision"""
+        new = self.load_revision(resume_id, number)
+        if new is None:
+            return None
+        if number > 1:
+            old = self.load_revision(resume_id, number - 1)
+        else:
+            old = revisions.field_data({})
+        return revisions.unified_diff(old, new, f"revision {number - 1}", f"revision {number}")
 
     def load_resume(self, resume_id):
         cursor = self.conn.cursor()
@@ -66,21 +663,108 @@ class ResumeDatabase:
         cursor.execute('SELECT id, name, updated_at FROM resumes ORDER BY updated_at DESC')
         return cursor.fetchall()
 
+    def list_resumes(self, limit=None, after=None, name_filter=None):
+        """
+        One page of saved resumes, most recently updated first
+
+        Args:
+            limit: rows per page, DATABASE_CONFIG['page_size'] by default
+            after: page_cursor() of the last row of the previous page, None for the first page
+            name_filter: only names containing this text (case-insensitive)
+
+        Returns:
+            list: (id, name, updated_at) rows
+        """
+        return self.list_page('resumes', 'name', 'updated_at', limit, after, name_filter)
+
+    def search_resumes(self, query, limit=None, prefix=True):
+        """
+        Saved resumes matching every word of query, best match first
+
+        Name matches rank above skills, then experience, then education.
+
+        Args:
+            query: free text, e.g. "python acme"
+            limit: most rows to return, DATABASE_CONFIG['page_size'] by default
+            prefix: let each word match the start of longer words
+
+        Returns:
+            list: (id, name, updated_at, snippet) rows, matches in snippet wrapped in [ ]
+        """
+        return self.search('resumes', 'name', 'updated_at', query, limit, prefix)
+
+    def iter_resumes(self, page_size=None):
+        """Yield (id, name, updated_at) for every saved resume, a page at a time"""
+        after = None
+        while True:
+            rows = self.list_resumes(page_size, after)
+            yield from rows
+            if len(rows) < (page_size or DATABASE_CONFIG['page_size']):
+                return
+            after = self.page_cursor(rows[-1])
+
     def save_generated_resume(self, title, content, mode='template'):
         """Save a generated resume output"""
-        cursor = self.conn.cursor()
+        return self.save_generated_resumes_many([(title, content, mode)])[0]
+
+    def save_generated_resumes_many(self, rows, batch_size=None):
+        """
+        Save many generated resumes, one transaction per chunk
+
+        Args:
+            rows: iterable of (title, content, mode) tuples
+            batch_size: rows per transaction, DATABASE_CONFIG['batch_size'] by default
+
+        Returns:
+            list: new row ids, in input order
+        """
+        batch_size = batch_size or DATABASE_CONFIG['batch_size']
+        ids = []
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= batch_size:
+                ids.extend(self.insert_generated_chunk(chunk))
+                chunk = []
+        if chunk:
+            ids.extend(self.insert_generated_chunk(chunk))
+        return ids
+
+    def insert_generated_chunk(self, chunk):
+        conn = self.conn
         now = datetime.now().isoformat()
-        cursor.execute('''
-            INSERT INTO generated_resumes (title, content, mode, created_at)
-            VALUES (?, ?, ?, ?)
-        ''', (title, content, mode, now))
-        self.conn.commit()
-        return cursor.lastrowid
+        ids = []
+        # take the write lock up front so another writer can't slip in
+        # between our first read and first write (SQLITE_BUSY mid-chunk)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = conn.cursor()
+            for title, content, mode in chunk:
+                key = self.store_content(cursor, content, title)
+                cursor.execute('''
+                    INSERT INTO generated_resumes (title, content_hash, mode, created_at)
+                    VALUES (?, ?, ?, ?)
+                ''', (title, key, mode, now))
+                ids.append(cursor.lastrowid)
+                if self.fts_enabled:
+                    # no trigger for this index, see CONTENTLESS_SEARCH
+                    cursor.execute(
+                        'INSERT INTO generated_resumes_fts (rowid, title, content) VALUES (?, ?, ?)',
+                        (cursor.lastrowid, title, content)
+                    )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return ids
 
     def load_generated_resume(self, resume_id):
         """Load a generated resume by ID"""
         cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM generated_resumes WHERE id = ?', (resume_id,))
+        cursor.execute(
+            f'SELECT g.id, g.title, {BODY_SQL.format(row="g")}, g.mode, g.created_at FROM generated_resumes g WHERE g.id = ?',
+            (resume_id,)
+        )
         row = cursor.fetchone()
         if row:
             return {
@@ -98,3 +782,25 @@ class ResumeDatabase:
         cursor.execute('SELECT id, title, created_at FROM generated_resumes ORDER BY created_at DESC')
         return cursor.fetchall()
 
+    def list_generated_resumes(self, limit=None, after=None, title_filter=None):
+        """
+        One page of generated resumes, newest first
+
+        Args:
+            limit: rows per page, DATABASE_CONFIG['page_size'] by default
+            after: page_cursor() of the last row of the previous page, None for the first page
+            title_filter: only titles containing this text (case-insensitive)
+
+        Returns:
+            list: (id, title, created_at) rows
+        """
+        return self.list_page('generated_resumes', 'title', 'created_at', limit, after, title_filter)
+
+    def search_generated_resumes(self, query, limit=None, prefix=True):
+        """
+        Generated resumes matching every word of query, best match first
+
+        Returns:
+            list: (id, title, created_at, snippet) rows, see search_resumes
+        """
+        return self.search('generated_resumes', 'title', 'created_at', query, limit, prefix)
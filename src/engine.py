@@ -1,169 +1,414 @@
-AI_AVAILABLE = False
-try:
-    import importlib.util
-    spec = importlib.util.find_spec("transformers")
-    if spec is not None:
-        AI_AVAILABLE = True
-except:
-    pass
+import hashlib
+import logging
+import random
+import threading
+from functools import lru_cache
+
+from src.cancellation import CancelToken
+from src.config import AI_CONFIG, CACHE_CONFIG
+from src.generation_cache import GenerationCache
+from src.inference import create_backend
+from src.layouts import get_layout
+from src.resume_model import DETAIL, HEADING, parse_resume
+from src.roles import get_role_index
+from src.scheduler import MicroBatchScheduler
+from src.skills import get_skill_index
+from src.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+_ai_available = None
+
+
+def ai_libraries_available():
+    """Check once whether transformers is installed, without importing it"""
+    global _ai_available
+    if _ai_available is None:
+        try:
+            import importlib.util
+            _ai_available = importlib.util.find_spec("transformers") is not None
+        except Exception:
+            _ai_available = False
+    return _ai_available
+
+
+def __getattr__(name):
+    # AI_AVAILABLE used to be computed at import time, keep it working lazily
+    if name == 'AI_AVAILABLE':
+        return ai_libraries_available()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=4096)
+def select_role_bullets(job_title):
+    """
+    Pick up to 4 bullets from the bank for the job title's role family
+
+    The choice is seeded from a SHA-256 digest of the title rather than
+    hash(), which is randomized per process, and uses its own Random
+    instance so the global random state is never touched. The result only
+    depends on the title, so it is memoized.
+
+    Returns:
+        tuple: bullet lines
+    """
+    # figure out what kind of job this is
+    options = get_role_index().bullets_for(job_title)
+
+    seed = int.from_bytes(hashlib.sha256(job_title.encode('utf-8')).digest()[:8], 'big')
+    rng = random.Random(seed)
+    return tuple(rng.sample(options, min(4, len(options))))
 
 
 class ResumeEngine:
     """Main engine for generating resumes"""
 
-    def __init__(self):
+    def __init__(self, cache=None):
         self.ai_model = None
         self.ai_tokenizer = None
         self.model_loaded = False
+        # only one thread may load the model, others wait for it
+        self.load_lock = threading.Lock()
+        self.warmup_thread = None
+        self.model_name = AI_CONFIG['model_name']
+        self.backend_name = AI_CONFIG.get('backend', 'torch')
+        # cache misses from every thread meet here and share model batches
+        self.scheduler = MicroBatchScheduler(
+            self.run_model_batch,
+            max_batch_size=AI_CONFIG.get('max_batch_size', 8),
+            max_wait_ms=AI_CONFIG.get('max_wait_ms', 10),
+        )
+        self.deterministic = CACHE_CONFIG['deterministic']
+        self.tracer = tracer
+        # parses and classifies each distinct skills field once
+        self.skill_index = get_skill_index()
+
+        # reuse model outputs for prompts we've already seen
+        if cache is None:
+            cache = GenerationCache(
+                max_entries=CACHE_CONFIG['max_entries'],
+                db_path=CACHE_CONFIG['db_path'],
+                reuse_sampled=CACHE_CONFIG['reuse_sampled'],
+            )
+        self.cache = cache
 
-    def load_ai_model(self):
-        """Try to load the AI model if transformers library is available"""
-        if not AI_AVAILABLE:
-            print("AI libraries not available")
+        # per-thread generation state, see last_fallbacks
+        self.local = threading.local()
+
+        # section outputs from the last generation, keyed by section name,
+        # as (input digest, text) so unchanged sections can be reused
+        self.last_sections = {}
+
+    @property
+    def ai_enabled(self):
+        """Whether AI mode can work here, checked on first use"""
+        # the fake backend works without transformers installed
+        return self.backend_name == 'fake' or ai_libraries_available()
+
+    @property
+    def last_fallbacks(self):
+        """AI sections the last generation on this thread filled from templates"""
+        return getattr(self.local, 'fallbacks', 0)
+
+    def count_fallback(self, section):
+        self.tracer.count(f'fallback:{section}')
+        self.local.fallbacks = self.last_fallbacks + 1
+
+    def load_ai_model(self, progress=None):
+        """
+        Try to load the AI model if transformers library is available
+
+        Safe to call from several threads - a caller that arrives while
+        another thread is loading waits for that load instead of starting
+        a second one.
+
+        progress: optional callable that receives status messages
+        """
+        if not self.ai_enabled:
+            logger.warning("AI libraries not available")
             return False
 
-        try:
-            # only load once
+        # only load once
+        if self.model_loaded:
+            return True
+
+        with self.load_lock:
+            # someone else may have finished loading while we waited
             if self.model_loaded:
                 return True
 
-            print("Loading AI model... (this may take a moment)")
+            try:
+                logger.info("Loading AI model... (this may take a moment)")
+
+                # reduce noise from transformers logging
+                logging.getLogger("transformers").setLevel(logging.ERROR)
+
+                # the backend (plain torch, int8 or ONNX) comes from AI_CONFIG;
+                # it exposes the same generate() as a transformers model
+                backend = create_backend(AI_CONFIG)
+                backend.load(progress)
+                self.ai_tokenizer = backend.tokenizer
+                self.ai_model = backend
+                self.backend_name = backend.name
+                self.model_loaded = True
+                logger.info("AI model loaded successfully!")
+                return True
+            except Exception as e:
+                logger.warning("Failed to load AI model: %s", e)
+                return False
+
+    def warm_up(self, progress=None):
+        """Load the model and run one tiny generation to prime the kernels"""
+        if not self.load_ai_model(progress):
+            if progress:
+                progress("AI model unavailable")
+            return False
 
-            # import here so startup is faster
-            from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-            import logging
+        try:
+            if progress:
+                progress("Warming up AI model...")
+            tokenized = self.ai_tokenizer("Hello", return_tensors="pt")
+            self.ai_model.generate(input_ids=tokenized.input_ids, max_length=5)
+        except Exception as e:
+            logger.warning("AI warm-up generation failed: %s", e)
 
-            # reduce noise from transformers logging
-            logging.getLogger("transformers").setLevel(logging.ERROR)
+        if progress:
+            progress("AI model ready")
+        return True
 
-            # using FLAN-T5 base model - works well for text generation
-            model_name = "google/flan-t5-base"
-            self.ai_tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.ai_model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-            self.model_loaded = True
-            print("AI model loaded successfully!")
-            return True
-        except Exception as e:
-            print(f"Failed to load AI model: {str(e)}")
-            return False
+    def start_warmup(self, progress=None):
+        """
+        Start loading the AI model on a background thread
+
+        Does nothing if the model is already loaded or a warm-up is running.
+        Generation requests that arrive mid-load wait on the same load.
+        """
+        if not self.ai_enabled or self.model_loaded:
+            return None
+        if self.warmup_thread is not None and self.warmup_thread.is_alive():
+            return self.warmup_thread
+
+        self.warmup_thread = threading.Thread(target=self.warm_up, args=(progress,), daemon=True)
+        self.warmup_thread.start()
+        return self.warmup_thread
 
-    def generate_resume(self, data, mode='template'):
+    def generate_resume(self, data, mode='template', cancel_token=None, layout=None):
         """
         Generate resume content
 
         Args:
             data: dict with keys: name, email, phone, education, skills, experience
             mode: 'template' or 'ai'
+            cancel_token: optional CancelToken, AI sections left when it stops
+                use templates (defaults to AI_CONFIG['deadline_seconds'],
+                a token started with start=False runs once the model is loaded)
+            layout: layout name ('classic', 'compact', 'two_column'),
+                defaults to LAYOUT_CONFIG['default']
 
         Returns:
             str: Formatted resume text
         """
-        if mode == 'ai' and AI_AVAILABLE:
-            return self.create_ai_resume(data)
+        if mode == 'ai' and self.ai_enabled:
+            return self.create_ai_resume(data, cancel_token, layout)
         else:
-            return self.create_template_resume(data)
+            return self.create_template_resume(data, layout)
+
+    def generate_many(self, records, mode='template', workers=None, chunksize=16, layout=None):
+        """
+        Generate resumes for many records across a process pool
+
+        Args:
+            records: iterable of data dicts (see generate_resume)
+            mode: 'template' or 'ai'
+            workers: number of processes, defaults to the CPU count;
+                1 runs everything in this process
+            chunksize: records handed to a worker at a time
+            layout: layout name, see generate_resume
+
+        Yields:
+            str: formatted resume text, in the same order as records
+        """
+        if workers == 1:
+            for data in records:
+                yield self.generate_resume(data, mode, layout=layout)
+            return
+
+        from src.parallel import imap_resumes
+
+        for index, (resume_text, error) in enumerate(imap_resumes(records, mode, workers, chunksize, layout=layout)):
+            if error is not None:
+                raise RuntimeError(f"Record {index} failed: {error}")
+            yield resume_text
 
-    def create_template_resume(self, data):
+    def stream_resume(self, data, mode='template', progress=None, cancel_token=None, layout=None):
+        """
+        Generate resume content as a stream of text chunks
+
+        Headings and finished sections are yielded as soon as they are
+        ready, so a caller can show the header straight away while the AI
+        sections are still running. Joining the chunks gives exactly what
+        generate_resume returns.
+
+        Args:
+            data: dict with keys: name, email, phone, education, skills, experience
+            mode: 'template' or 'ai'
+            progress: optional callable that receives status messages
+            cancel_token: optional CancelToken, see generate_resume
+            layout: layout name, see generate_resume
+
+        Yields:
+            str: the next piece of resume text
+        """
+        if mode == 'ai' and self.ai_enabled:
+            return self.iter_ai_resume(data, progress, cancel_token, layout)
+        else:
+            return self.iter_template_resume(data, layout)
+
+    def section_digest(self, *fields):
+        """Hash the input fields a section depends on"""
+        joined = '\x1f'.join(fields)
+        return hashlib.sha1(joined.encode('utf-8')).hexdigest()
+
+    def previous_section(self, name, digest):
+        """Return the last output for a section if its inputs haven't changed"""
+        entry = self.last_sections.get(name)
+        if entry is not None and entry[0] == digest:
+            return entry[1]
+        return None
+
+    def reuse_section(self, sections, name, digest, build):
+        """Reuse a section from the last generation or build it again"""
+        text = self.previous_section(name, digest)
+        if text is None:
+            with self.tracer.span('format', name):
+                text = build()
+        sections[name] = (digest, text)
+        return text
+
+    def reset_sections(self):
+        """Forget the last generation so every section is rebuilt"""
+        self.last_sections = {}
+
+    def parse_resume(self, data):
+        """Parse the data dict once for every section (cached per input)"""
+        return parse_resume(data, self.skill_index)
+
+    def create_template_resume(self, data, layout=None):
         """Generate resume using templates"""
-        resume = []
+        return ''.join(self.iter_template_resume(data, layout))
+
+    def create_ai_resume(self, data, cancel_token=None, layout=None):
+        """Generate AI-enhanced resume"""
+        return ''.join(self.iter_ai_resume(data, cancel_token=cancel_token, layout=layout))
+
+    def iter_template_resume(self, data, layout=None):
+        """Yield a template resume section by section"""
+        sections = {}
+        resume = self.parse_resume(data)
+        layout = get_layout(layout)
+        self.local.fallbacks = 0
 
         # header with name and contact info
-        name_upper = data['name'].upper()
-        resume.append(name_upper)
-        contact_line = data['email'] + " | " + data['phone']
-        resume.append(contact_line)
-        resume.append("=" * 80)
-        resume.append("")
+        yield layout.header(resume)
+        yield from self.iter_template_body(resume, sections, layout)
+        self.last_sections = sections
 
+    def iter_template_body(self, resume, sections, layout):
+        """Everything below the header in a template resume"""
         # professional summary section
-        summary_text = self.generate_summary(data['education'], data['skills'], data['experience'])
-        resume.append("PROFESSIONAL SUMMARY")
-        resume.append("-" * 80)
-        resume.append(summary_text)
-        resume.append("")
+        yield layout.heading('summary')
+        summary_text = self.reuse_section(
+            sections, 'template:summary',
+            self.section_digest(resume.education_text, resume.skills_text, resume.experience_text),
+            lambda: self.generate_summary(resume)
+        )
+        yield layout.body('summary', summary_text)
 
         # skills section
-        resume.append("SKILLS")
-        resume.append("-" * 80)
-        skills_formatted = self.format_skills(data['skills'])
-        resume.append(skills_formatted)
-        resume.append("")
+        yield layout.heading('skills')
+        skills_formatted = self.reuse_section(
+            sections, 'skills', self.section_digest(resume.skills_text),
+            lambda: self.format_skills(resume.skills)
+        )
+        yield layout.body('skills', skills_formatted)
 
         # work experience section
-        resume.append("PROFESSIONAL EXPERIENCE")
-        resume.append("-" * 80)
-        exp_formatted = self.format_experience(data['experience'], data['skills'])
-        resume.append(exp_formatted)
-        resume.append("")
+        yield layout.heading('experience')
+        exp_formatted = self.reuse_section(
+            sections, 'template:experience',
+            self.section_digest(resume.experience_text),
+            lambda: self.format_experience(resume.experience)
+        )
+        yield layout.body('experience', exp_formatted)
 
         # education section
-        resume.append("EDUCATION")
-        resume.append("-" * 80)
-        edu_formatted = self.format_education(data['education'])
-        resume.append(edu_formatted)
+        yield layout.heading('education')
+        edu_formatted = self.reuse_section(
+            sections, 'education', self.section_digest(resume.education_text),
+            lambda: self.format_education(resume.education)
+        )
+        yield layout.body('education', edu_formatted, last=True)
 
-        final_resume = '\n'.join(resume)
-        return final_resume
+    def iter_ai_resume(self, data, progress=None, cancel_token=None, layout=None):
+        """Yield an AI-enhanced resume section by section"""
+        sections = {}
+        resume = self.parse_resume(data)
+        layout = get_layout(layout)
+        if cancel_token is None:
+            cancel_token = CancelToken(timeout=AI_CONFIG.get('deadline_seconds'), start=False)
+        self.local.fallbacks = 0
+
+        # put header at top - it doesn't need the model
+        yield layout.header(resume)
 
-    def create_ai_resume(self, data):
-        """Generate AI-enhanced resume"""
         # make sure model is loaded first
         if not self.model_loaded:
-            loaded_ok = self.load_ai_model()
+            loaded_ok = self.load_ai_model(progress)
             if not loaded_ok:
                 # fallback to template if AI doesn't work
-                return self.create_template_resume(data)
+                self.local.fallbacks = 1 + len(resume.experience.titles)
+                yield from self.iter_template_body(resume, sections, layout)
+                self.last_sections = sections
+                return
+
+        # the deadline is for generating, loading the model doesn't count
+        cancel_token.start()
 
-        resume = []
+        yield layout.heading('summary')
+        if progress:
+            progress("Generating AI sections...")
 
-        # put header at top
-        resume.append(data['name'].upper())
-        contact_info = f"{data['email']} | {data['phone']}"
-        resume.append(contact_info)
-        resume.append("=" * 80)
-        resume.append("")
+        # summary and every changed job go through the model in one batch
+        summary_ai, exp_with_ai = self.ai_generate_summary_and_experience(resume, sections, cancel_token)
 
         # generate AI summary
-        resume.append("PROFESSIONAL SUMMARY")
-        resume.append("-" * 80)
-        summary_ai = self.ai_generate_summary(data['education'], data['skills'], data['experience'])
-        resume.append(summary_ai)
-        resume.append("")
+        yield layout.body('summary', summary_ai)
 
         # add skills section
-        resume.append("CORE COMPETENCIES")
-        resume.append("-" * 80)
-        skills_text = self.format_skills(data['skills'])
-        resume.append(skills_text)
-        resume.append("")
+        yield layout.heading('competencies')
+        skills_text = self.reuse_section(
+            sections, 'skills', self.section_digest(resume.skills_text),
+            lambda: self.format_skills(resume.skills)
+        )
+        yield layout.body('competencies', skills_text)
 
         # AI-generated work experience
-        resume.append("PROFESSIONAL EXPERIENCE")
-        resume.append("-" * 80)
-        exp_with_ai = self.ai_generate_full_experience(
-            data['experience'], data['skills'], data['education']
-        )
-        resume.append(exp_with_ai)
-        resume.append("")
+        yield layout.heading('experience')
+        yield layout.body('experience', exp_with_ai)
 
         # education at the end
-        resume.append("EDUCATION")
-        resume.append("-" * 80)
-        edu_text = self.format_education(data['education'])
-        resume.append(edu_text)
+        yield layout.heading('education')
+        edu_text = self.reuse_section(
+            sections, 'education', self.section_digest(resume.education_text),
+            lambda: self.format_education(resume.education)
+        )
+        yield layout.body('education', edu_text, last=True)
 
-        result = '\n'.join(resume)
-        return result
+        self.last_sections = sections
 
-    def generate_summary(self, education, skills, experience):
+    def generate_summary(self, resume):
         """Create a professional summary based on the person's background"""
-        # parse out the skills
-        skills_normalized = skills.replace('\n', ',')
-        skill_list = []
-        for s in skills_normalized.split(','):
-            skill = s.strip()
-            if skill:
-                skill_list.append(skill)
+        skill_list = resume.skills.all
 
         # grab top 3 skills
         if len(skill_list) >= 3:
@@ -174,9 +419,7 @@ class ResumeEngine:
             top_skills = "various technical and professional skills"
 
         # check if they have work experience
-        exp_lines = experience.split('\n')
-        non_empty_lines = [line for line in exp_lines if line.strip()]
-        has_experience = len(non_empty_lines) > 2
+        has_experience = len(resume.experience.lines) > 2
 
         # write summary based on experience level
         if has_experience:
@@ -190,343 +433,421 @@ class ResumeEngine:
 
         return summary
 
-    def ai_generate_summary(self, education, skills, experience):
+    def ai_generate_summary(self, resume):
         """Let AI generate a more creative professional summary"""
-        try:
-            # get the key skills first
-            skills_normalized = skills.replace('\n', ',')
-            all_skills = [s.strip() for s in skills_normalized.split(',') if s.strip()]
-            skill_list = all_skills[:5]  # just take top 5
+        logger.debug("Generating AI summary...")
+        prompt = self.build_summary_prompt(resume)
+        outputs = self.ai_generate_batch([prompt])
+        summary, _ = self.finish_ai_summary(outputs[0], resume)
+        return summary
 
-            if skill_list:
-                skills_text = ', '.join(skill_list)
-            else:
-                skills_text = "various skills"
+    def build_summary_prompt(self, resume):
+        """Build the model prompt for the professional summary"""
+        # get the key skills first
+        skill_list = resume.skills.all[:5]  # just take top 5
+
+        if skill_list:
+            skills_text = ', '.join(skill_list)
+        else:
+            skills_text = "various skills"
 
-            # build a prompt for the AI model
-            education_snippet = education[:80] if len(education) > 80 else education
-            experience_snippet = experience[:100] if len(experience) > 100 else experience
+        # build a prompt for the AI model
+        education_snippet = resume.education_text[:80]
+        experience_snippet = resume.experience_text[:100]
 
-            prompt = f"""Write a professional resume summary (2-3 sentences) for someone with:
+        prompt = f"""Write a professional resume summary (2-3 sentences) for someone with:
 - Education: {education_snippet}
 - Skills: {skills_text}
 - Experience: {experience_snippet}
 
 The summary should highlight their strengths and career goals."""
+        return prompt
 
-            print(f"Generating AI summary...")
-
-            # tokenize the prompt
-            inputs = self.ai_tokenizer(prompt, return_tensors="pt", max_length=400, truncation=True)
-
-            # TODO: maybe adjust temperature lower for more consistent results?
-            # generate output
-            outputs = self.ai_model.generate(
-                inputs.input_ids,
-                max_length=180,
-                min_length=30,
-                temperature=0.85,
-                do_sample=True,
-                top_p=0.90,
-                repetition_penalty=1.4,
-            )
-
-            # decode the result
-            summary = self.ai_tokenizer.decode(outputs[0], skip_special_tokens=True)
-            summary = summary.strip()
+    def finish_ai_summary(self, raw_output, resume):
+        """
+        Clean up a raw model summary, falling back to the template one
 
-            print(f"Raw AI summary: {summary}")
+        Returns:
+            tuple: (summary text, True if the template fallback was used)
+        """
+        try:
+            if raw_output is not None:
+                with self.tracer.span('cleanup', 'summary'):
+                    summary = self.clean_ai_summary(raw_output)
 
-            # sometimes AI repeats the prompt, so clean it up
-            lower_summary = summary.lower()
-            if lower_summary.startswith('write') or lower_summary.startswith('create') or lower_summary.startswith('summary') or lower_summary.startswith('the summary'):
-                # try splitting by colon
-                if ':' in summary:
-                    parts = summary.split(':', 1)
-                    summary = parts[1].strip()
-                else:
-                    # try newline
-                    if '\n' in summary:
-                        parts = summary.split('\n', 1)
-                        summary = parts[1].strip()
-
-            # clean up any leftover instruction text
-            summary = summary.replace('Write a professional resume summary', '')
-            summary = summary.replace('(2-3 sentences)', '')
-            summary = summary.strip()
-
-            # just to be safe, strip again
-            if summary:
-                summary = summary.strip()
-
-            # make sure it's reasonable length
-            summary_length = len(summary)
-            if summary_length > 40 and summary_length < 500:
-                print(f"✓ AI generated summary: {summary[:100]}...")
-                return summary
-            else:
-                print(f"✗ AI summary too short/long ({summary_length} chars), using template")
+                if summary is not None:
+                    return summary, False
+                self.tracer.count('rejected:summary')
         except Exception as e:
-            print(f"AI summary generation failed: {str(e)}")
+            logger.warning("AI summary generation failed: %s", e)
 
         # if AI fails, fall back to template
-        return self.generate_summary(education, skills, experience)
+        self.count_fallback('summary')
+        with self.tracer.span('fallback', 'summary'):
+            return self.generate_summary(resume), True
+
+    def clean_ai_summary(self, raw_output):
+        """Strip prompt echoes from a model summary, None if it isn't usable"""
+        summary = raw_output.strip()
+        logger.debug("Raw AI summary: %s", summary)
+
+        # sometimes AI repeats the prompt, so clean it up
+        lower_summary = summary.lower()
+        if lower_summary.startswith('write') or lower_summary.startswith('create') or lower_summary.startswith('summary') or lower_summary.startswith('the summary'):
+            # try splitting by colon
+            if ':' in summary:
+                parts = summary.split(':', 1)
+                summary = parts[1].strip()
+            else:
+                # try newline
+                if '\n' in summary:
+                    parts = summary.split('\n', 1)
+                    summary = parts[1].strip()
+
+        # clean up any leftover instruction text
+        summary = summary.replace('Write a professional resume summary', '')
+        summary = summary.replace('(2-3 sentences)', '')
+        summary = summary.strip()
+
+        # make sure it's reasonable length
+        summary_length = len(summary)
+        if summary_length > 40 and summary_length < 500:
+            logger.debug("✓ AI generated summary: %s...", summary[:100])
+            return summary
+
+        logger.debug("✗ AI summary too short/long (%d chars), using template", summary_length)
+        return None
+
+    def ai_generate_summary_and_experience(self, resume, sections=None, cancel_token=None):
+        """
+        Generate the summary and every job block with one batched model call
+
+        Sections whose inputs match the last generation are reused as they
+        are, so only the changed ones go to the model. Sections that fell
+        back to templates (output rejected, cancelled or out of time)
+        aren't remembered, so the next generation tries them again.
+
+        Returns:
+            tuple: (summary text, experience section text)
+        """
+        if sections is None:
+            sections = {}
+
+        # the AI writes new bullets for every heading, old ones are dropped
+        job_titles = resume.experience.titles
+
+        # summary depends on everything, each job block on its title and the skills
+        summary_digest = self.section_digest(resume.education_text, resume.skills_text, resume.experience_text)
+        summary = self.previous_section('ai:summary', summary_digest)
+
+        job_digests = []
+        responsibilities = []
+        for i, job_title in enumerate(job_titles):
+            digest = self.section_digest(job_title, resume.skills_text)
+            job_digests.append(digest)
+            responsibilities.append(self.previous_section(f'ai:job:{i}', digest))
+
+        # summary prompt goes first, then one prompt per changed job
+        prompts = []
+        if summary is None:
+            prompts.append(self.build_summary_prompt(resume))
+        changed_jobs = [i for i, resp in enumerate(responsibilities) if resp is None]
+        for i in changed_jobs:
+            prompts.append(self.build_job_prompt(job_titles[i], resume))
+
+        if prompts:
+            logger.debug("Generating %d AI section(s)...", len(prompts))
+            outputs = self.ai_generate_batch(prompts, cancel_token)
+        else:
+            logger.debug("No AI sections changed, reusing previous output")
+            outputs = []
+
+        if summary is None:
+            summary, used_fallback = self.finish_ai_summary(outputs[0], resume)
+            # only model text is remembered, a fallback is retried next time
+            if not used_fallback:
+                sections['ai:summary'] = (summary_digest, summary)
+            outputs = outputs[1:]
+        else:
+            sections['ai:summary'] = (summary_digest, summary)
+
+        generated_jobs = set(i for i, resp in enumerate(responsibilities) if resp is not None)
+        for i, raw_output in zip(changed_jobs, outputs):
+            bullets, used_fallback = self.finish_ai_responsibilities(raw_output, job_titles[i], resume.skills)
+            responsibilities[i] = '\n'.join(bullets)
+            if not used_fallback:
+                generated_jobs.add(i)
 
-    def ai_generate_full_experience(self, experience, skills, education):
+        for i in generated_jobs:
+            sections[f'ai:job:{i}'] = (job_digests[i], responsibilities[i])
+
+        experience_text = self.assemble_ai_experience(resume, job_titles, responsibilities)
+        return summary, experience_text
+
+    def ai_generate_full_experience(self, resume, cancel_token=None):
         """Generate experience section with AI help"""
+        job_titles = resume.experience.titles
+        prompts = [self.build_job_prompt(job_title, resume) for job_title in job_titles]
+        outputs = self.ai_generate_batch(prompts, cancel_token) if prompts else []
+
+        responsibilities = []
+        for job_title, raw_output in zip(job_titles, outputs):
+            bullets, _ = self.finish_ai_responsibilities(raw_output, job_title, resume.skills)
+            responsibilities.append('\n'.join(bullets))
+        return self.assemble_ai_experience(resume, job_titles, responsibilities)
+
+    def assemble_ai_experience(self, resume, job_titles, responsibilities):
+        """Build the experience section from each job's bullet block"""
         # handle empty experience
-        if not experience.strip():
+        if not resume.experience.lines:
             return "  • Ready to bring dedication and skills to a new role"
 
-        # split into lines and remove empty ones
-        all_lines = experience.split('\n')
-        lines = []
-        for line in all_lines:
-            stripped = line.strip()
-            if stripped:
-                lines.append(stripped)
-
         formatted = []
-        current_job = None
-        line_index = 0
-
-        # go through each line
-        while line_index < len(lines):
-            current_line = lines[line_index]
-
-            # job titles are usually short lines without bullets
-            is_job_title = len(current_line) < 100
-            has_bullet = current_line.startswith('•') or current_line.startswith('-') or current_line.startswith('  ')
-
-            if is_job_title and not has_bullet:
-                # found a job title
-                if len(formatted) > 0:
-                    formatted.append("")  # add blank line between jobs
-
-                formatted.append(current_line.upper())
-                current_job = current_line
-
-                # now generate AI content for this job
-                print(f"\nGenerating AI content for: {current_job}")
-                responsibilities = self.ai_generate_job_responsibilities(current_job, skills, education)
-
-                for resp in responsibilities:
-                    formatted.append(resp)
-
-                # skip the old bullet points since we made new ones
-                line_index += 1
-                while line_index < len(lines):
-                    next_line = lines[line_index]
-                    has_bullet_next = next_line.startswith('•') or next_line.startswith('-') or next_line.startswith('  ')
-                    is_long_line = len(next_line) > 100
-
-                    if has_bullet_next or is_long_line:
-                        line_index += 1
-                    else:
-                        break
-                continue
+        for job_title, bullets in zip(job_titles, responsibilities):
+            if len(formatted) > 0:
+                formatted.append("")  # add blank line between jobs
 
-            line_index += 1
+            formatted.append(job_title.upper())
+            formatted.append(bullets)
 
         # put it all together
         if formatted:
             result = '\n'.join(formatted)
         else:
-            result = self.format_experience(experience, skills)
+            result = self.format_experience(resume.experience)
 
-        print(f"\nGenerated experience section ({len(result)} chars)")
+        logger.debug("Generated experience section (%d chars)", len(result))
         return result
 
-    def ai_generate_job_responsibilities(self, job_title, skills, education):
+    def ai_generate_job_responsibilities(self, job_title, resume):
         """Use AI to create job bullet points"""
-        try:
-            # prepare the skills text - keep it short
-            if skills and len(skills) > 100:
-                skills_text = skills[:100]
-            elif skills:
-                skills_text = skills
-            else:
-                skills_text = "various professional skills"
+        logger.debug("Generating AI responsibilities for: %s...", job_title)
+        prompt = self.build_job_prompt(job_title, resume)
+        outputs = self.ai_generate_batch([prompt])
+        bullets, _ = self.finish_ai_responsibilities(outputs[0], job_title, resume.skills)
+        return bullets
+
+    def build_job_prompt(self, job_title, resume):
+        """Build the model prompt for one job's bullet points"""
+        # prepare the skills text - keep it short
+        if resume.skills_text:
+            skills_text = resume.skills_text[:100]
+        else:
+            skills_text = "various professional skills"
 
-            # make a simple prompt for the model
-            prompt = f"""Create 4 professional resume bullet points for a {job_title} position using these skills: {skills_text}
+        # make a simple prompt for the model
+        prompt = f"""Create 4 professional resume bullet points for a {job_title} position using these skills: {skills_text}
 
 Each bullet point should describe an achievement or responsibility. Be specific and use action verbs."""
+        return prompt
+
+    def get_generation_params(self):
+        """Decoding settings shared by every prompt in a batch"""
+        # one set of decoding settings for the whole batch - the cleanup
+        # steps still reject anything too short or too long per section
+        params = {
+            'max_length': 250,
+            'min_length': 40,
+            'repetition_penalty': 1.5,
+            'no_repeat_ngram_size': 2,
+            'num_return_sequences': 1,
+        }
+        if self.deterministic:
+            params['do_sample'] = False
+        else:
+            params['do_sample'] = True
+            params['temperature'] = 0.9
+            params['top_p'] = 0.92
+        return params
 
-            print(f"Generating AI responsibilities for: {job_title}...")
-
-            # tokenize and generate
-            tokenized = self.ai_tokenizer(prompt, return_tensors="pt", max_length=400, truncation=True)
-            generated = self.ai_model.generate(
-                tokenized.input_ids,
-                max_length=250,
-                min_length=60,
-                temperature=0.95,
-                do_sample=True,
-                top_p=0.92,
-                repetition_penalty=1.5,
-                no_repeat_ngram_size=2,
-                num_return_sequences=1,
-            )
+    def ai_generate_batch(self, prompts, cancel_token=None):
+        """
+        Run the prompts through the model in padded batches
+
+        Prompts already in the cache are answered from it and only the
+        misses go to the model, through the micro-batching scheduler so
+        concurrent callers share batches.
+
+        Returns:
+            list: decoded text for each prompt, or None where generation
+            failed or never ran
+        """
+        if not prompts:
+            return []
+
+        params = self.get_generation_params()
+        use_cache = self.cache is not None and self.cache.is_cacheable(params)
+
+        results = [None] * len(prompts)
+        keys = [None] * len(prompts)
+        pending = []
+        for i, prompt in enumerate(prompts):
+            if use_cache:
+                keys[i] = self.cache.make_key(prompt, f"{self.model_name}:{self.backend_name}", params)
+                cached = self.cache.get(keys[i])
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            pending.append(i)
+
+        if not pending:
+            logger.debug("All %d prompt(s) answered from cache", len(prompts))
+            return results
+
+        outputs = self.scheduler([prompts[i] for i in pending], cancel_token)
+        for i, text in zip(pending, outputs):
+            results[i] = text
+            if use_cache and text is not None:
+                self.cache.put(keys[i], text)
+
+        return results
+
+    def run_model_batch(self, prompts, cancel_token=None):
+        """
+        Send one batch of prompts to the model in a single generate call
+
+        The cancel token is checked inside generation; a batch that gets
+        cut short is thrown away.
+
+        Returns:
+            list: decoded text per prompt, None where generation failed or was stopped
+        """
+        params = self.get_generation_params()
+        stop_criteria = None
+        try:
+            # pad to the longest prompt so the batch goes through generate once
+            with self.tracer.span('tokenize', 'batch'):
+                tokenized = self.ai_tokenizer(
+                    prompts,
+                    return_tensors="pt",
+                    max_length=400,
+                    truncation=True,
+                    padding=True,
+                )
+            extra = {}
+            if cancel_token is not None:
+                extra['stopping_criteria'], stop_criteria = self.ai_model.stopping_criteria(cancel_token)
+
+            with self.tracer.span('generate', 'batch'):
+                generated = self.ai_model.generate(
+                    input_ids=tokenized.input_ids,
+                    attention_mask=tokenized.attention_mask,
+                    **params,
+                    **extra
+                )
 
             # decode what the AI generated
-            ai_text = self.ai_tokenizer.decode(generated[0], skip_special_tokens=True)
-            ai_text = ai_text.strip()
+            with self.tracer.span('decode', 'batch'):
+                decoded = self.ai_tokenizer.batch_decode(generated, skip_special_tokens=True)
+        except Exception as e:
+            logger.warning("AI generation error: %s", e)
+            return [None] * len(prompts)
 
-            print(f"Raw AI output: {ai_text[:200]}...")
+        if stop_criteria is not None and stop_criteria.triggered:
+            logger.info("Generation stopped mid-batch, %d section(s) left for templates", len(prompts))
+            return [None] * len(prompts)
 
-            # clean up the output - sometimes it includes the prompt
-            split_lines = ai_text.split('\n')
-            good_lines = []
+        return decoded
 
-            for ln in split_lines:
-                ln = ln.strip()
+    def finish_ai_responsibilities(self, raw_output, job_title, skills):
+        """
+        Turn raw model output into bullets, falling back to the template ones
 
-                # skip prompt repetition
-                skip_words = ['create', 'bullet point', 'resume', 'should describe', 'each bullet']
-                should_skip = False
-                for word in skip_words:
-                    if word in ln.lower():
-                        should_skip = True
-                        break
+        Returns:
+            tuple: (bullet lines, True if the template fallback was used)
+        """
+        try:
+            if raw_output is not None:
+                with self.tracer.span('cleanup', 'job'):
+                    bullet_list = self.clean_ai_responsibilities(raw_output)
 
-                if should_skip:
-                    continue
+                if bullet_list is not None:
+                    return bullet_list, False
+                self.tracer.count('rejected:job')
+        except Exception as e:
+            logger.warning("AI generation error: %s", e)
 
-                # remove markers like bullets, numbers, etc
-                ln = ln.lstrip('•')
-                ln = ln.lstrip('-')
-                ln = ln.lstrip('*')
-                ln = ln.lstrip('1234567890. ')
+        # fallback to template
+        self.count_fallback('job')
+        with self.tracer.span('fallback', 'job'):
+            return self.generate_template_responsibilities(job_title, skills), True
+
+    def clean_ai_responsibilities(self, raw_output):
+        """Pull bullet points out of raw model output, None if there aren't enough"""
+        ai_text = raw_output.strip()
+        logger.debug("Raw AI output: %s...", ai_text[:200])
+
+        # clean up the output - sometimes it includes the prompt
+        split_lines = ai_text.split('\n')
+        good_lines = []
+
+        for ln in split_lines:
+            ln = ln.strip()
+
+            # skip prompt repetition
+            skip_words = ['create', 'bullet point', 'resume', 'should describe', 'each bullet']
+            should_skip = False
+            for word in skip_words:
+                if word in ln.lower():
+                    should_skip = True
+                    break
 
-                # keep if it looks good
-                if len(ln) > 15 and len(ln) < 300:
-                    good_lines.append(ln)
+            if should_skip:
+                continue
 
-            # turn into bullet format
+            # remove markers like bullets, numbers, etc
+            ln = ln.lstrip('•')
+            ln = ln.lstrip('-')
+            ln = ln.lstrip('*')
+            ln = ln.lstrip('1234567890. ')
+
+            # keep if it looks good
+            if len(ln) > 15 and len(ln) < 300:
+                good_lines.append(ln)
+
+        # turn into bullet format
+        bullet_list = []
+        for line in good_lines:
+            bullet_list.append(f"  • {line}")
+
+        # if not enough bullets, try splitting differently
+        if len(bullet_list) < 2:
+            # split by periods
+            modified_text = ai_text.replace('. ', '.|')
+            parts = modified_text.split('|')
             bullet_list = []
-            for line in good_lines:
-                bullet_list.append(f"  • {line}")
-
-            # if not enough bullets, try splitting differently
-            if len(bullet_list) < 2:
-                # split by periods
-                modified_text = ai_text.replace('. ', '.|')
-                parts = modified_text.split('|')
-                bullet_list = []
-
-                for part in parts:
-                    cleaned = part.strip()
-                    cleaned = cleaned.strip('.')
-
-                    # check if it's valid content
-                    bad_words = ['create', 'bullet', 'write', 'describe']
-                    is_bad = False
-                    for bad in bad_words:
-                        if bad in cleaned.lower():
-                            is_bad = True
-                            break
-
-                    if not is_bad and len(cleaned) > 20 and len(cleaned) < 250:
-                        bullet_list.append(f"  • {cleaned}")
-
-            # check if we got good results
-            if len(bullet_list) >= 2:
-                print(f"✓ AI generated {len(bullet_list)} creative bullets!")
-                # return max 4 bullets
-                return bullet_list[:4]
-            else:
-                print(f"✗ AI output didn't produce valid bullets, using template")
-                # debug: print the raw output to see what went wrong
-                # print(f"DEBUG: {ai_text}")
 
-        except Exception as e:
-            print(f"AI generation error: {str(e)}")
+            for part in parts:
+                cleaned = part.strip()
+                cleaned = cleaned.strip('.')
 
+                # check if it's valid content
+                bad_words = ['create', 'bullet', 'write', 'describe']
+                is_bad = False
+                for bad in bad_words:
+                    if bad in cleaned.lower():
+                        is_bad = True
+                        break
 
-        # fallback to template
-        return self.generate_template_responsibilities(job_title, skills)
+                if not is_bad and len(cleaned) > 20 and len(cleaned) < 250:
+                    bullet_list.append(f"  • {cleaned}")
+
+        # check if we got good results
+        if len(bullet_list) >= 2:
+            logger.debug("✓ AI generated %d creative bullets!", len(bullet_list))
+            # return max 4 bullets
+            return bullet_list[:4]
+
+        logger.debug("✗ AI output didn't produce valid bullets, using template")
+        return None
 
     def generate_template_responsibilities(self, job_title, skills):
         """Make some reasonable bullet points based on job title"""
-        # figure out what kind of job this is
-        if job_title:
-            job_lower = job_title.lower()
-        else:
-            job_lower = ""
-
-        # parse skills if available
-        skill_list = []
-        if skills:
-            for s in skills.split(',')[:3]:
-                skill_list.append(s.strip())
-
-        # use job title as seed so same title gives same bullets
-        random.seed(hash(job_title))
-        bullets = []
-
-        # check what kind of role this is and pick appropriate bullets
-        if 'developer' in job_lower or 'engineer' in job_lower or 'programmer' in job_lower or 'software' in job_lower:
-            dev_options = [
-                "  • Developed and maintained software applications using modern technologies and frameworks",
-                "  • Designed and implemented scalable solutions to meet business requirements",
-                "  • Collaborated with cross-functional teams to deliver projects on schedule",
-                "  • Participated in code reviews and maintained high code quality standards",
-                "  • Optimized database queries and improved application performance by 30%",
-                "  • Implemented best practices for code quality, testing, and documentation",
-            ]
-            sample_size = min(4, len(dev_options))
-            bullets.extend(random.sample(dev_options, sample_size))
-
-
-        elif 'manager' in job_lower or 'lead' in job_lower or 'supervisor' in job_lower or 'director' in job_lower:
-            mgmt_options = [
-                "  • Led team initiatives and coordinated project deliverables across departments",
-                "  • Managed cross-functional teams to achieve strategic objectives",
-                "  • Improved team efficiency through process optimization and automation",
-                "  • Developed and executed strategic plans aligned with company goals",
-                "  • Mentored team members and fostered professional development",
-                "  • Built and maintained relationships with key stakeholders and clients",
-            ]
-            sample_size = min(4, len(mgmt_options))
-            bullets.extend(random.sample(mgmt_options, sample_size))
-
-        elif 'analyst' in job_lower or 'data' in job_lower or 'research' in job_lower:
-            analyst_options = [
-                "  • Analyzed complex data sets to drive business insights and recommendations",
-                "  • Created comprehensive reports and visualizations for stakeholders",
-                "  • Identified trends and opportunities for operational improvements",
-                "  • Collaborated with business units to define metrics and reporting requirements",
-                "  • Automated reporting processes to improve efficiency and accuracy",
-                "  • Maintained data quality and integrity across multiple systems",
-            ]
-            sample_size = min(4, len(analyst_options))
-            bullets.extend(random.sample(analyst_options, sample_size))
-
-        elif 'designer' in job_lower or 'creative' in job_lower or 'ui' in job_lower or 'ux' in job_lower:
-            design_options = [
-                "  • Created user-centered designs that improved engagement and satisfaction",
-                "  • Collaborated with stakeholders to understand requirements and objectives",
-                "  • Maintained brand consistency across all deliverables and touchpoints",
-                "  • Produced wireframes, mockups, and prototypes for new features",
-                "  • Conducted user research and usability testing to inform design decisions",
-                "  • Managed multiple design projects with competing deadlines",
-            ]
-            sample_size = min(4, len(design_options))
-            bullets.extend(random.sample(design_options, sample_size))
+        # parsed skills, if any
+        skill_list = skills.all[:3]
 
-        else:
-            # generic bullets for other roles
-            generic_options = [
-                "  • Contributed to team objectives and organizational goals",
-                "  • Demonstrated strong problem-solving and analytical skills",
-                "  • Collaborated effectively with colleagues and stakeholders",
-                "  • Managed multiple priorities in fast-paced environment",
-                "  • Maintained excellent communication with internal and external partners",
-                "  • Provided excellent customer service and support",
-            ]
-            sample_size = min(4, len(generic_options))
-            bullets.extend(random.sample(generic_options, sample_size))
+        # same title gives the same bullets, in every process
+        bullets = list(select_role_bullets(job_title or ""))
 
         # add a skill-specific bullet if we have room
         if skill_list and len(bullets) < 4:
@@ -534,44 +855,18 @@ Each bullet point should describe an achievement or responsibility. Be specific
             skill_text = ', '.join(first_two)
             bullets.insert(0, f"  • Utilized {skill_text} to deliver high-quality results")
 
-        # reset random seed
-        random.seed()
-
         # return max 4 bullets
         return bullets[:4]
 
     def format_skills(self, skills):
-        """Format the skills section nicely"""
+        """Format the skills section (a parsed SkillSet) nicely"""
         if not skills:
             return "• To be added based on role requirements"
 
-        # normalize line breaks to commas
-        normalized = skills.replace('\n', ',')
-        skill_list = []
-        for s in normalized.split(','):
-            cleaned = s.strip()
-            if cleaned:
-                skill_list.append(cleaned)
-
-        # separate into technical and soft skills
-        technical = []
-        soft = []
-        soft_keywords = ['communication', 'leadership', 'teamwork', 'management',
-                        'problem-solving', 'analytical', 'creative', 'collaboration']
-
-        for skill in skill_list:
-            skill_lower = skill.lower()
-            is_soft = False
-
-            for keyword in soft_keywords:
-                if keyword in skill_lower:
-                    is_soft = True
-                    break
-
-            if is_soft:
-                soft.append(skill)
-            else:
-                technical.append(skill)
+        # already split into technical and soft skills by the parser
+        skill_list = skills.all
+        technical = skills.technical
+        soft = skills.soft
 
         # build the result string
         result = ""
@@ -591,60 +886,38 @@ Each bullet point should describe an achievement or responsibility. Be specific
 
         return result
 
-    def format_experience(self, experience, skills=""):
-        """Format the experience section"""
-        if not experience:
+    def format_experience(self, experience):
+        """Format the experience section from the parsed lines"""
+        if not experience.text:
             return "• Ready to bring dedication and skills to a new role"
 
-        # split into lines and clean up
-        all_lines = experience.split('\n')
-        lines = []
-        for line in all_lines:
-            cleaned = line.strip()
-            if cleaned:
-                lines.append(cleaned)
-
         formatted = []
-        for line in lines:
-            # job titles are usually short and don't have bullets
-            is_short = len(line) < 100
-            has_bullet = line.startswith('•') or line.startswith('-')
-
-            if is_short and not has_bullet:
+        for line in experience.lines:
+            if line.kind == HEADING:
                 # this is probably a job title or company
                 if formatted:
-                    formatted.append("\n" + line.upper())
+                    formatted.append("\n" + line.text.upper())
                 else:
-                    formatted.append(line.upper())
+                    formatted.append(line.text.upper())
+            elif line.kind == DETAIL:
+                # a description without a bullet
+                formatted.append("  • " + line.text)
             else:
-                # this is a description or bullet point
-                if not has_bullet:
-                    formatted.append("  • " + line)
-                else:
-                    formatted.append("  " + line)
+                formatted.append("  " + line.text)
 
         return '\n'.join(formatted)
 
     def format_education(self, education):
-        """Format the education section"""
+        """Format the education section from the parsed entries"""
         if not education:
             return "• Educational background to be provided"
 
-        # split and clean lines
-        all_lines = education.split('\n')
-        lines = []
-        for line in all_lines:
-            cleaned = line.strip()
-            if cleaned:
-                lines.append(cleaned)
-
         formatted = []
-        for line in lines:
+        for entry in education:
             # add bullet if not already there
-            if not line.startswith('•') and not line.startswith('-'):
-                formatted.append("• " + line)
+            if not entry.has_bullet:
+                formatted.append("• " + entry.text)
             else:
-                formatted.append(line)
+                formatted.append(entry.text)
 
         return '\n'.join(formatted)
-
@@ -0,0 +1,132 @@
+"""
+Content-addressed cache for AI generation outputs
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+
+class GenerationCache:
+    """
+    Two-tier cache for model outputs
+
+    Entries are keyed on the normalized prompt, the model name and the
+    decoding parameters. The first tier is a bounded in-memory LRU, the
+    second an optional SQLite file that survives restarts. The file is
+    only opened (and created) on the first get or put, so an engine
+    whose outputs are never cacheable doesn't leave one behind.
+    """
+
+    def __init__(self, max_entries=512, db_path=None, reuse_sampled=False):
+        self.max_entries = max_entries
+        self.reuse_sampled = reuse_sampled
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self.db_path = db_path
+        self.conn = None
+
+    @staticmethod
+    def normalize_prompt(prompt):
+        """Collapse whitespace so cosmetic differences hit the same entry"""
+        return ' '.join(prompt.split())
+
+    def make_key(self, prompt, model_name, params):
+        """Build the content hash for one prompt"""
+        payload = json.dumps({
+            'prompt': self.normalize_prompt(prompt),
+            'model': model_name,
+            'params': params,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def is_cacheable(self, params):
+        """Sampled outputs are only reused when the caller opts in"""
+        return not params.get('do_sample') or self.reuse_sampled
+
+    def _connection(self, create=True):
+        """The SQLite tier, opened on first use (call with the lock held)"""
+        if self.conn is None and self.db_path:
+            if not create and not os.path.exists(self.db_path):
+                return None
+            # the UI generates on a worker thread, so allow cross-thread use
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS generation_cache (
+                    key TEXT PRIMARY KEY,
+                    output TEXT NOT NULL,
+                    created_at TEXT
+                )
+            ''')
+            self.conn.commit()
+        return self.conn
+
+    def get(self, key):
+        """Look up a key, returns None on a miss"""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return self.memory[key]
+
+            conn = self._connection()
+            if conn is not None:
+                row = conn.execute(
+                    'SELECT output FROM generation_cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row:
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, output):
+        """Store an output in both tiers"""
+        with self.lock:
+            self._remember(key, output)
+            conn = self._connection()
+            if conn is not None:
+                conn.execute(
+                    'INSERT OR REPLACE INTO generation_cache (key, output, created_at) VALUES (?, ?, ?)',
+                    (key, output, datetime.now().isoformat())
+                )
+                conn.commit()
+
+    def _remember(self, key, output):
+        self.memory[key] = output
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self.lock:
+            self.memory.clear()
+            # nothing to clear on disk if the file was never written
+            conn = self._connection(create=False)
+            if conn is not None:
+                conn.execute('DELETE FROM generation_cache')
+                conn.commit()
+
+    def stats(self):
+        """Hit/miss counters for diagnostics"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'hit_rate': self.hits / total if total else 0.0,
+                'memory_entries': len(self.memory),
+            }
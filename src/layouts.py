@@ -0,0 +1,160 @@
+"""
+Text layouts for generated resumes
+
+A layout decides how the header, the section headings and the spacing
+between sections look; the engine only produces section content. Each
+layout is described by a small spec and compiled once when this module
+is imported, so rendering is a few dict lookups and string joins no
+matter how many resumes a batch job renders.
+
+New layouts can be added to LAYOUT_SPECS, registered at runtime with
+register_layout, or loaded from the JSON file in LAYOUT_CONFIG.
+"""
+import json
+import textwrap
+
+from src.config import LAYOUT_CONFIG
+
+SECTION_TITLES = {
+    'summary': 'PROFESSIONAL SUMMARY',
+    'skills': 'SKILLS',
+    'competencies': 'CORE COMPETENCIES',     # skills heading in AI mode
+    'experience': 'PROFESSIONAL EXPERIENCE',
+    'education': 'EDUCATION',
+}
+
+# header fields: name, name_upper, email, phone; heading field: title
+LAYOUT_SPECS = {
+    'classic': {
+        'description': "Full-width sections with ruled headings",
+        'header': "{name_upper}\n{email} | {phone}\n" + "=" * 80 + "\n\n",
+        'heading': "{title}\n" + "-" * 80 + "\n",
+        'separator': "\n\n",
+    },
+    'compact': {
+        'description': "One-line header, short headings, no rules",
+        'header': "{name_upper} | {email} | {phone}\n\n",
+        'heading': "{title}\n",
+        'separator': "\n\n",
+        'titles': {
+            'summary': 'SUMMARY',
+            'competencies': 'SKILLS',
+            'experience': 'EXPERIENCE',
+        },
+    },
+    'two_column': {
+        'description': "Section names in a left column, content wrapped on the right",
+        'header': "{name_upper}\n{email} | {phone}\n" + "=" * 80 + "\n\n",
+        'heading': "",
+        'separator': "\n\n",
+        'columns': [20, 80],
+        'titles': {
+            'summary': 'SUMMARY',
+            'competencies': 'SKILLS',
+            'experience': 'EXPERIENCE',
+        },
+    },
+}
+
+
+class Layout:
+    """A compiled layout spec"""
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.description = spec.get('description', '')
+        self.header_format = spec['header']
+        self.separator = spec.get('separator', "\n\n")
+
+        titles = dict(SECTION_TITLES)
+        titles.update(spec.get('titles', {}))
+        # every heading is rendered here, once
+        self.headings = {key: spec['heading'].format(title=title) for key, title in titles.items()}
+
+        self.columns = spec.get('columns')
+        if self.columns:
+            label_width, width = self.columns
+            self.labels = {key: title.ljust(label_width) for key, title in titles.items()}
+            self.gutter = " " * label_width
+            self.content_width = width - label_width
+            # one wrapper per hanging indent, shared by every render
+            self.wrappers = {}
+
+    def header(self, resume):
+        return self.header_format.format(
+            name=resume.name, name_upper=resume.name.upper(), email=resume.email, phone=resume.phone
+        )
+
+    def heading(self, key):
+        return self.headings[key]
+
+    def body(self, key, text, last=False):
+        """Section content plus whatever follows it"""
+        if self.columns:
+            text = self.two_columns(key, text)
+        return text if last else text + self.separator
+
+    def two_columns(self, key, text):
+        lines = []
+        for line in text.split('\n'):
+            if not line.strip():
+                lines.append('')
+                continue
+            # keep bullets hanging, continuation lines line up with the text
+            indent = len(line) - len(line.lstrip(' •-'))
+            lines.extend(self.wrapper_for(indent).wrap(line) or [''])
+
+        out = []
+        label = self.labels[key]
+        for line in lines:
+            out.append((label + line).rstrip())
+            label = self.gutter
+        return '\n'.join(out)
+
+    def wrapper_for(self, indent):
+        wrapper = self.wrappers.get(indent)
+        if wrapper is None:
+            wrapper = textwrap.TextWrapper(
+                width=self.content_width, subsequent_indent=' ' * indent, break_on_hyphens=False
+            )
+            self.wrappers[indent] = wrapper
+        return wrapper
+
+
+LAYOUTS = {name: Layout(name, spec) for name, spec in LAYOUT_SPECS.items()}
+
+
+def register_layout(name, spec):
+    """Compile and add a layout, replacing one with the same name"""
+    LAYOUTS[name] = Layout(name, spec)
+    return LAYOUTS[name]
+
+
+def get_layout(layout=None):
+    """
+    Look up a layout by name
+
+    Args:
+        layout: a layout name, a Layout, or None for LAYOUT_CONFIG['default']
+
+    Raises:
+        ValueError: for an unknown name
+    """
+    if isinstance(layout, Layout):
+        return layout
+    name = layout or LAYOUT_CONFIG['default']
+    if name not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{name}' (available: {', '.join(sorted(LAYOUTS))})")
+    return LAYOUTS[name]
+
+
+def load_layouts(path):
+    """Register every spec in a JSON file of {name: spec}"""
+    with open(path, encoding='utf-8') as f:
+        specs = json.load(f)
+    for name, spec in specs.items():
+        register_layout(name, spec)
+
+
+if LAYOUT_CONFIG['layouts_path']:
+    load_layouts(LAYOUT_CONFIG['layouts_path'])
@@ -0,0 +1,65 @@
+"""
+Process-pool generation for bulk jobs
+
+Template mode is pure Python, so threads don't help - each worker
+process gets its own ResumeEngine instead. In AI mode every worker loads
+the model once and is limited to a fixed number of torch threads so the
+workers don't fight over the CPU.
+"""
+import multiprocessing
+import os
+
+from src.config import AI_CONFIG
+
+# one engine per worker process, created by init_worker
+_engine = None
+_mode = 'template'
+_layout = None
+
+
+def init_worker(mode, torch_threads, layout=None):
+    """Set up the engine for this worker process"""
+    global _engine, _mode, _layout
+    from src.engine import ResumeEngine
+    from src.generation_cache import GenerationCache
+
+    _mode = mode
+    _layout = layout
+    # memory-only cache, workers shouldn't all write the same SQLite file
+    _engine = ResumeEngine(cache=GenerationCache(db_path=None))
+
+    if mode == 'ai':
+        AI_CONFIG['num_threads'] = torch_threads
+        _engine.load_ai_model()
+
+
+def generate_one(data):
+    """Worker task - returns (resume text, error message)"""
+    try:
+        return _engine.generate_resume(data, _mode, layout=_layout), None
+    except Exception as e:
+        return None, str(e)
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def imap_resumes(records, mode='template', workers=None, chunksize=16, torch_threads=None, layout=None):
+    """
+    Generate resumes across a process pool
+
+    Results come back in input order and are yielded as soon as the next
+    one in line is finished.
+
+    Yields:
+        tuple: (resume text, None) or (None, error message) per record
+    """
+    workers = workers or default_workers()
+    if torch_threads is None:
+        torch_threads = max(1, default_workers() // workers)
+
+    initargs = (mode, torch_threads, layout)
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=initargs) as pool:
+        for result in pool.imap(generate_one, records, chunksize=chunksize):
+            yield result
@@ -1,10 +1,8 @@
 """
 PDF Export Functionality
+
+reportlab is imported on the first export rather than at startup.
 """
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 
 
 class PDFExporter:
@@ -18,6 +16,12 @@ class PDFExporter:
         resume_text: the formatted text to put in PDF
         file_path: where to save the PDF
         """
+        # import here so startup is faster
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
         # set up the PDF document with margins
         pdf_doc = SimpleDocTemplate(
             file_path,
@@ -0,0 +1,148 @@
+"""
+Structured resume input
+
+parse_resume turns the raw data dict into a ParsedResume once; every
+formatter and prompt builder reads from it instead of splitting and
+classifying the same text again. Parses are cached per input, so
+regenerating an unchanged resume doesn't parse it twice.
+"""
+from functools import lru_cache
+
+from src.skills import get_skill_index
+
+# kinds of experience lines
+HEADING = 'heading'     # job title or company line
+BULLET = 'bullet'       # line that already starts with a bullet marker
+DETAIL = 'detail'       # long free-text line without a marker
+
+BULLET_MARKERS = ('•', '-')
+
+
+class ExperienceLine:
+    """One non-empty line of the experience field"""
+
+    __slots__ = ('text', 'kind')
+
+    def __init__(self, text, kind):
+        self.text = text
+        self.kind = kind
+
+
+class Job:
+    """A heading line and the lines under it"""
+
+    __slots__ = ('title', 'details')
+
+    def __init__(self, title, details):
+        self.title = title
+        self.details = details
+
+
+class Experience:
+    """Parsed experience field"""
+
+    __slots__ = ('text', 'lines', 'jobs')
+
+    def __init__(self, text, lines, jobs):
+        self.text = text
+        self.lines = lines
+        self.jobs = jobs
+
+    @property
+    def titles(self):
+        return [job.title for job in self.jobs]
+
+
+class EducationEntry:
+    """One non-empty line of the education field"""
+
+    __slots__ = ('text', 'has_bullet')
+
+    def __init__(self, text, has_bullet):
+        self.text = text
+        self.has_bullet = has_bullet
+
+
+class ParsedResume:
+    """
+    Everything the formatters need, parsed once
+
+    The raw fields are kept too: section digests and prompt snippets
+    are built from the text exactly as it was entered.
+    """
+
+    __slots__ = ('name', 'email', 'phone', 'education_text', 'skills_text', 'experience_text',
+                 'skills', 'experience', 'education')
+
+    def __init__(self, name, email, phone, education_text, skills_text, experience_text,
+                 skills, experience, education):
+        self.name = name
+        self.email = email
+        self.phone = phone
+        self.education_text = education_text
+        self.skills_text = skills_text
+        self.experience_text = experience_text
+        self.skills = skills
+        self.experience = experience
+        self.education = education
+
+
+def non_empty_lines(text):
+    return [line.strip() for line in text.split('\n') if line.strip()]
+
+
+def parse_experience(text):
+    """
+    Sort experience lines into headings, bullets and details
+
+    Short lines without a bullet marker are headings (job titles, company
+    lines); each heading starts a job that owns the lines after it.
+    """
+    lines = []
+    jobs = []
+    details = None
+    for line in non_empty_lines(text):
+        if line.startswith(BULLET_MARKERS):
+            kind = BULLET
+        elif len(line) < 100:
+            kind = HEADING
+        else:
+            kind = DETAIL
+        lines.append(ExperienceLine(line, kind))
+
+        if kind == HEADING:
+            details = []
+            jobs.append(Job(line, details))
+        elif details is not None:
+            details.append(line)
+
+    return Experience(text, tuple(lines), tuple(jobs))
+
+
+def parse_education(text):
+    """One entry per non-empty line"""
+    return tuple(EducationEntry(line, line.startswith(BULLET_MARKERS)) for line in non_empty_lines(text))
+
+
+@lru_cache(maxsize=256)
+def parse_fields(name, email, phone, education, skills, experience, skill_index):
+    return ParsedResume(
+        name, email, phone, education, skills, experience,
+        skills=skill_index.parse(skills),
+        experience=parse_experience(experience),
+        education=parse_education(education),
+    )
+
+
+def parse_resume(data, skill_index=None):
+    """
+    Parse a data dict (name, email, phone, education, skills, experience)
+
+    Returns:
+        ParsedResume: shared between calls with the same input, don't modify it
+    """
+    return parse_fields(
+        data['name'], data['email'], data['phone'],
+        data['education'], data['skills'], data['experience'],
+        skill_index or get_skill_index(),
+    )
@@ -0,0 +1,79 @@
+"""
+Resume revisions as compact line diffs
+
+Each saved edit of a resume is a revision. Most revisions are stored as
+a patch against the one before: for every field that changed, the line
+ranges that were replaced and their new lines. Every few revisions a
+full snapshot is stored instead, so rebuilding any revision applies at
+most a handful of patches.
+"""
+import difflib
+import json
+import zlib
+
+FIELDS = ('name', 'email', 'phone', 'education', 'skills', 'experience')
+
+SNAPSHOT = 'snapshot'
+PATCH = 'patch'
+
+
+def make_patch(old, new):
+    """
+    Differences between two data dicts
+
+    Returns:
+        dict: {field: [[start, end, new_lines], ...]} for changed fields,
+        ranges are line indexes into the old text
+    """
+    patch = {}
+    for field in FIELDS:
+        if old[field] == new[field]:
+            continue
+        old_lines = old[field].split('\n')
+        new_lines = new[field].split('\n')
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        patch[field] = [[i1, i2, new_lines[j1:j2]]
+                        for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+    return patch
+
+
+def apply_patch(old, patch):
+    """The data dict make_patch(old, new) was made from"""
+    new = dict(old)
+    for field, ops in patch.items():
+        lines = old[field].split('\n')
+        out = []
+        position = 0
+        for start, end, replacement in ops:
+            out.extend(lines[position:start])
+            out.extend(replacement)
+            position = end
+        out.extend(lines[position:])
+        new[field] = '\n'.join(out)
+    return new
+
+
+def encode(value):
+    return zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+
+def decode(data):
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+
+def field_data(data):
+    """Just the versioned fields, as strings"""
+    return {field: data.get(field) or '' for field in FIELDS}
+
+
+def unified_diff(old, new, old_label, new_label):
+    """Readable diff between two data dicts, one block per changed field"""
+    lines = []
+    for field in FIELDS:
+        if old[field] == new[field]:
+            continue
+        lines.extend(difflib.unified_diff(
+            old[field].split('\n'), new[field].split('\n'),
+            f"{field} ({old_label})", f"{field} ({new_label})", lineterm=''
+        ))
+    return '\n'.join(lines)
@@ -0,0 +1,126 @@
+"""
+Role classification for template bullets
+
+A job title is matched against a taxonomy of role families (software,
+sales, nursing, ...), each with its own bullet bank and a list of role
+names and synonyms. The taxonomy lives in a JSON file (src/data/roles.json
+by default) and is loaded once into a token index:
+
+- titles are lowercased and split into tokens, abbreviations are
+  expanded ("sr" -> "senior", "eng" -> "engineer", "front-end" ->
+  "frontend"; other hyphenated words are split) and words that say
+  nothing about the kind of role ("senior", "of") are dropped
+- every role phrase is filed under its rarest token, so a title only
+  looks at the handful of phrases that share a token with it
+
+The phrase with the most tokens that is fully contained in the title
+wins; ties go to the family listed first.
+"""
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+
+from src.config import ROLES_CONFIG
+
+DEFAULT_TAXONOMY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'roles.json')
+
+TOKEN_RE = re.compile(r"[a-z0-9+#&.-]+")
+
+
+class RoleIndex:
+    """Token index over role phrases, see the module docstring"""
+
+    def __init__(self, taxonomy, cache_size=4096):
+        self.aliases = {key: tuple(value.split()) for key, value in taxonomy.get('aliases', {}).items()}
+        self.stopwords = frozenset(taxonomy.get('stopwords', []))
+        self.generic = tuple(taxonomy['generic'])
+
+        self.families = []
+        self.bullets = {}
+        phrases = []
+        for priority, (family, entry) in enumerate(taxonomy['families'].items()):
+            self.families.append(family)
+            self.bullets[family] = tuple(entry['bullets'])
+            for role in entry['roles']:
+                tokens = frozenset(self.tokenize(role))
+                if tokens:
+                    phrases.append((tokens, family, priority))
+
+        # file each phrase under its least common token
+        frequency = {}
+        for tokens, _, _ in phrases:
+            for token in tokens:
+                frequency[token] = frequency.get(token, 0) + 1
+
+        self.index = {}
+        for tokens, family, priority in phrases:
+            anchor = min(tokens, key=lambda token: (frequency[token], token))
+            self.index.setdefault(anchor, []).append((len(tokens), -priority, tokens, family))
+
+        # most specific phrase first, so the first hit per anchor is its best
+        for entries in self.index.values():
+            entries.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+
+        self.match = lru_cache(maxsize=cache_size)(self.match_uncached)
+
+    @classmethod
+    def from_file(cls, path, cache_size=4096):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f), cache_size)
+
+    def tokenize(self, title):
+        tokens = []
+        for raw in TOKEN_RE.findall(title.lower()):
+            raw = raw.strip('.-')
+            # "front-end" can be an alias itself, other hyphenated words are split
+            words = raw.split('-') if '-' in raw and raw not in self.aliases else (raw,)
+            for word in words:
+                word = word.strip('.')
+                if not word:
+                    continue
+                for token in self.aliases.get(word, (word,)):
+                    if token not in self.stopwords:
+                        tokens.append(token)
+        return tokens
+
+    def match_uncached(self, title):
+        """
+        Find the role family for a job title
+
+        Returns:
+            str: family name, or None when nothing in the taxonomy matches
+        """
+        tokens = set(self.tokenize(title))
+        best = None
+        for token in tokens:
+            for entry in self.index.get(token, ()):
+                if best is not None and entry[:2] <= best[:2]:
+                    break
+                if entry[2] <= tokens:
+                    best = entry
+                    break
+        return best[3] if best is not None else None
+
+    def bullets_for(self, title):
+        """Bullet bank for a job title, the generic one when nothing matches"""
+        family = self.match(title)
+        if family is None:
+            return self.generic
+        return self.bullets[family]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_role_index():
+    """The process-wide index, loaded from ROLES_CONFIG on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = ROLES_CONFIG['taxonomy_path'] or DEFAULT_TAXONOMY
+                _index = RoleIndex.from_file(path, ROLES_CONFIG['cache_size'])
+    return _index
@@ -0,0 +1,140 @@
+"""
+Dynamic micro-batching for model calls
+
+Concurrent callers (GUI jobs, server requests, batch threads) submit
+prompts one by one. A dispatcher thread waits until it has
+max_batch_size prompts or the oldest one has waited max_wait_ms, sorts
+what it has by length so each batch pads as little as possible, runs
+the batches and resolves every caller's future.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+from src.cancellation import TokenGroup
+
+logger = logging.getLogger(__name__)
+
+
+def word_count(prompt):
+    """Cheap stand-in for the token length of a prompt"""
+    return len(prompt.split())
+
+
+class PendingPrompt:
+    __slots__ = ('prompt', 'token', 'future', 'length', 'queued_at')
+
+    def __init__(self, prompt, token, length):
+        self.prompt = prompt
+        self.token = token
+        self.future = Future()
+        self.length = length
+        self.queued_at = time.monotonic()
+
+
+class MicroBatchScheduler:
+    """
+    Collects prompts from many callers and runs them in shared batches
+
+    run_batch: callable(prompts, cancel_token) -> list of outputs, making
+        exactly one model call for the prompts it is given
+    """
+
+    def __init__(self, run_batch, max_batch_size=8, max_wait_ms=10, length_fn=word_count):
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.length_fn = length_fn
+
+        self.cond = threading.Condition()
+        self.pending = []
+        self.thread = None
+
+        # metrics
+        self.batches = 0
+        self.prompts = 0
+        self.largest_batch = 0
+        self.total_wait = 0.0
+
+    def __call__(self, prompts, cancel_token=None):
+        """Submit prompts and wait for their outputs, in the same order"""
+        futures = self.submit_many(prompts, cancel_token)
+        return [future.result() for future in futures]
+
+    def submit(self, prompt, cancel_token=None):
+        """Queue one prompt, returns a Future for its output"""
+        return self.submit_many([prompt], cancel_token)[0]
+
+    def submit_many(self, prompts, cancel_token=None):
+        items = [PendingPrompt(p, cancel_token, self.length_fn(p)) for p in prompts]
+        with self.cond:
+            self.start()
+            self.pending.extend(items)
+            self.cond.notify()
+        return [item.future for item in items]
+
+    def start(self):
+        # the dispatcher only starts once AI mode is actually used
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.dispatch_loop, daemon=True)
+            self.thread.start()
+
+    def dispatch_loop(self):
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+
+                # wait for a full batch or until the oldest prompt is due
+                while len(self.pending) < self.max_batch_size:
+                    remaining = self.pending[0].queued_at + self.max_wait - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+
+                taken = self.pending
+                self.pending = []
+
+            # similar lengths side by side means less padding per batch
+            taken.sort(key=lambda item: item.length)
+            for start in range(0, len(taken), self.max_batch_size):
+                self.run(taken[start:start + self.max_batch_size])
+
+    def run(self, batch):
+        dispatched = time.monotonic()
+        token = TokenGroup(item.token for item in batch)
+        if token.should_stop():
+            outputs = [None] * len(batch)
+        else:
+            try:
+                outputs = self.run_batch([item.prompt for item in batch], token)
+            except Exception as e:
+                logger.warning("Batched generation failed: %s", e)
+                outputs = [None] * len(batch)
+
+        with self.cond:
+            self.batches += 1
+            self.prompts += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self.total_wait += sum(dispatched - item.queued_at for item in batch)
+
+        for item, output in zip(batch, outputs):
+            item.future.set_result(output)
+
+    @property
+    def queue_depth(self):
+        with self.cond:
+            return len(self.pending)
+
+    def stats(self):
+        """Queue depth and batch-size metrics"""
+        with self.cond:
+            return {
+                'queue_depth': len(self.pending),
+                'batches': self.batches,
+                'prompts': self.prompts,
+                'avg_batch_size': self.prompts / self.batches if self.batches else 0.0,
+                'largest_batch': self.largest_batch,
+                'avg_wait_ms': 1000.0 * self.total_wait / self.prompts if self.prompts else 0.0,
+            }
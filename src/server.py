@@ -0,0 +1,101 @@
+"""
+Local generation server
+
+Keeps one ResumeEngine (and one copy of the model) in memory and serves
+it over localhost HTTP, so several GUI sessions or batch jobs share it.
+Each request runs on its own thread; the engine's micro-batching
+scheduler merges the prompts of requests that arrive within a short
+window into shared model batches.
+
+Endpoints:
+    POST /generate   {"data": {...}, "mode": "ai", "layout": "classic", "timeout": 60} -> {"resume": "..."}
+    GET  /health     -> {"status": "ok", "model_loaded": true, ...}
+    GET  /stats      -> cache and batching counters
+"""
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.cancellation import CancelToken
+from src.config import SERVER_CONFIG
+from src.layouts import get_layout
+from src.tracing import tracer
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints on top of the shared engine"""
+
+    def do_GET(self):
+        engine = self.server.engine
+        if self.path == '/health':
+            self.send_json(200, {
+                'status': 'ok',
+                'ai_enabled': engine.ai_enabled,
+                'model_loaded': engine.model_loaded,
+                'backend': engine.backend_name,
+            })
+        elif self.path == '/stats':
+            cache_stats = engine.cache.stats() if engine.cache is not None else {}
+            self.send_json(200, {
+                'cache': cache_stats,
+                'batching': engine.scheduler.stats(),
+                'tracing': tracer.stats(),
+            })
+        else:
+            self.send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/generate':
+            self.send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            data = body['data']
+            mode = body.get('mode', 'template')
+            timeout = body.get('timeout')
+            layout = get_layout(body.get('layout'))
+        except Exception as e:
+            self.send_json(400, {'error': f"bad request: {str(e)}"})
+            return
+
+        try:
+            token = CancelToken(timeout=timeout, start=False) if timeout else None
+            engine = self.server.engine
+            resume_text = engine.generate_resume(data, mode, cancel_token=token, layout=layout)
+            self.send_json(200, {'resume': resume_text, 'fallbacks': engine.last_fallbacks})
+        except Exception as e:
+            self.send_json(500, {'error': str(e)})
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # keep the console quiet, one line per request is too much under load
+        pass
+
+
+class GenerationServer(ThreadingHTTPServer):
+    """HTTP server that owns the shared engine"""
+
+    daemon_threads = True
+
+    def __init__(self, engine, host=None, port=None, window_ms=None):
+        host = host or SERVER_CONFIG['host']
+        port = SERVER_CONFIG['port'] if port is None else port
+        window_ms = SERVER_CONFIG['window_ms'] if window_ms is None else window_ms
+        super().__init__((host, port), GenerationRequestHandler)
+
+        self.engine = engine
+        # wait a little longer than a desktop session would for batches to fill
+        engine.scheduler.max_wait = window_ms / 1000.0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
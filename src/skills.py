@@ -0,0 +1,155 @@
+"""
+Skill parsing and classification
+
+The skills field is split and classified once per distinct input; every
+section that needs the skills (summary, skills section, prompts,
+template bullets) reads the same cached SkillSet.
+
+Keywords are compiled into a single trie-shaped regex, so a taxonomy of
+thousands of skills is matched in one pass over each skill instead of
+one substring check per keyword.
+"""
+import json
+import re
+import threading
+from functools import lru_cache
+
+from src.config import SKILLS_CONFIG
+
+# what format_skills has always treated as soft skills
+SOFT_KEYWORDS = ['communication', 'leadership', 'teamwork', 'management',
+                 'problem-solving', 'analytical', 'creative', 'collaboration']
+
+
+class SkillSet:
+    """Parsed skills field, in input order"""
+
+    __slots__ = ('all', 'technical', 'soft')
+
+    def __init__(self, all_skills, technical, soft):
+        self.all = all_skills
+        self.technical = technical
+        self.soft = soft
+
+    def __bool__(self):
+        return bool(self.all)
+
+    def __len__(self):
+        return len(self.all)
+
+
+def split_skills(skills):
+    """Split a comma or newline separated skills field"""
+    if not skills:
+        return ()
+    return tuple(s.strip() for s in skills.replace('\n', ',').split(',') if s.strip())
+
+
+def build_trie_pattern(words):
+    """
+    Regex source matching any of the words
+
+    Shared prefixes are factored out ("java", "javascript" -> "java(?:script)?")
+    so the regex engine follows one branch per character rather than
+    trying every word in turn. Longer words win over their prefixes.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def pattern_for(node):
+        branches = [re.escape(ch) + pattern_for(child)
+                    for ch, child in sorted(node.items()) if ch != '']
+        if not branches:
+            return ''
+        ends_here = '' in node
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if ends_here else group
+
+    return pattern_for(trie)
+
+
+class SkillIndex:
+    """
+    Classifies skills as technical or soft
+
+    soft_keywords / technical_keywords: lowercase terms matched anywhere in
+    a skill. When a skill contains terms of both kinds, the longest term
+    decides; skills matching nothing count as technical.
+    """
+
+    def __init__(self, soft_keywords=SOFT_KEYWORDS, technical_keywords=(), cache_size=1024):
+        self.categories = {}
+        for keyword in technical_keywords:
+            self.categories[keyword.lower()] = 'technical'
+        # soft wins when a term is listed as both
+        for keyword in soft_keywords:
+            self.categories[keyword.lower()] = 'soft'
+
+        self.matcher = None
+        if self.categories:
+            self.matcher = re.compile(build_trie_pattern(self.categories))
+
+        # one parse per distinct skills field, shared by every section
+        self.parse = lru_cache(maxsize=cache_size)(self.parse_uncached)
+
+    @classmethod
+    def from_file(cls, path, cache_size=1024):
+        """
+        Load a taxonomy file
+
+        The file is JSON: {"soft": ["leadership", ...], "technical": ["python", ...]}.
+        The built-in soft keywords are always included.
+        """
+        with open(path, encoding='utf-8') as f:
+            taxonomy = json.load(f)
+        soft = SOFT_KEYWORDS + [k for k in taxonomy.get('soft', []) if k]
+        technical = [k for k in taxonomy.get('technical', []) if k]
+        return cls(soft, technical, cache_size)
+
+    def classify(self, skill):
+        """Return 'technical' or 'soft' for a single skill"""
+        if self.matcher is None:
+            return 'technical'
+        best = None
+        for match in self.matcher.finditer(skill.lower()):
+            if best is None or len(match.group()) > len(best):
+                best = match.group()
+        if best is None:
+            return 'technical'
+        return self.categories[best]
+
+    def parse_uncached(self, skills):
+        skill_list = split_skills(skills)
+        technical = []
+        soft = []
+        for skill in skill_list:
+            if self.classify(skill) == 'soft':
+                soft.append(skill)
+            else:
+                technical.append(skill)
+        return SkillSet(skill_list, tuple(technical), tuple(soft))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_skill_index():
+    """The process-wide index, loaded from SKILLS_CONFIG on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = SKILLS_CONFIG['taxonomy_path']
+                cache_size = SKILLS_CONFIG['cache_size']
+                if path:
+                    _index = SkillIndex.from_file(path, cache_size)
+                else:
+                    _index = SkillIndex(cache_size=cache_size)
+    return _index
@@ -0,0 +1,145 @@
+"""
+Timing spans and counters for the generation pipeline
+
+The engine wraps each stage of a section (tokenize, generate, decode,
+cleanup, fallback, format) in tracer.span(stage, section). With tracing
+off a span is a shared no-op object, so instrumented code only pays for
+one method call. With tracing on, finished spans are totalled per
+(stage, section) and handed to every registered exporter.
+
+Exporters are plain callables: exporter(stage, section, seconds).
+"""
+import logging
+import threading
+import time
+
+from src.config import TRACE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class NullSpan:
+    """Stand-in span used while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    """Times one stage of one section"""
+
+    __slots__ = ('tracer', 'stage', 'section', 'started')
+
+    def __init__(self, tracer, stage, section):
+        self.tracer = tracer
+        self.stage = stage
+        self.section = section
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.stage, self.section, time.perf_counter() - self.started)
+        return False
+
+
+class LoggingExporter:
+    """Writes every finished span to a logger"""
+
+    def __init__(self, logger_name='src.tracing.spans', level=logging.DEBUG):
+        self.logger = logging.getLogger(logger_name)
+        self.level = level
+
+    def __call__(self, stage, section, seconds):
+        self.logger.log(self.level, "%s %s %.2fms", stage, section, seconds * 1000.0)
+
+
+class Tracer:
+    """
+    Collects per-stage timings and event counters
+
+    Counters (rejected AI output, template fallbacks) are rare events and
+    are always counted; spans are only timed while the tracer is enabled.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.exporters = []
+        self.lock = threading.Lock()
+        self.counters = {}
+        # (stage, section) -> [calls, total seconds, slowest]
+        self.timings = {}
+
+    def span(self, stage, section=''):
+        """Context manager timing one stage, a no-op while disabled"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, stage, section)
+
+    def record(self, stage, section, seconds):
+        with self.lock:
+            entry = self.timings.get((stage, section))
+            if entry is None:
+                self.timings[(stage, section)] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+        for exporter in self.exporters:
+            try:
+                exporter(stage, section, seconds)
+            except Exception as e:
+                logger.warning("Trace exporter failed: %s", e)
+
+    def count(self, name, amount=1):
+        """Bump an event counter"""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+
+    def enable(self, exporter=None):
+        """Start timing spans, optionally adding an exporter"""
+        if exporter is not None:
+            self.add_exporter(exporter)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.timings = {}
+
+    def stats(self):
+        """Counters and per-stage totals in milliseconds"""
+        with self.lock:
+            spans = {}
+            for (stage, section), (calls, total, slowest) in sorted(self.timings.items()):
+                key = f"{stage}:{section}" if section else stage
+                spans[key] = {
+                    'calls': calls,
+                    'total_ms': round(total * 1000.0, 3),
+                    'avg_ms': round(total * 1000.0 / calls, 3),
+                    'max_ms': round(slowest * 1000.0, 3),
+                }
+            return {'counters': dict(self.counters), 'spans': spans}
+
+
+# shared by every engine in the process
+tracer = Tracer(enabled=TRACE_CONFIG['enabled'])
+if TRACE_CONFIG['enabled'] and TRACE_CONFIG['log_spans']:
+    tracer.add_exporter(LoggingExporter())
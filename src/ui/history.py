@@ -0,0 +1,136 @@
+"""
+Revision history window for a saved resume
+"""
+import tkinter as tk
+from tkinter import scrolledtext, messagebox
+
+from src.config import COLORS, DATABASE_CONFIG
+from src.ui.widgets import ModernButton
+
+
+class HistoryWindow(tk.Toplevel):
+    """
+    Lists a resume's revisions and shows what each one changed
+
+    Only the revision list is read up front, a page at a time; a
+    revision's diff is rebuilt when it's selected.
+    """
+    MORE = "⋯ more"
+
+    def __init__(self, parent, db, resume_id, on_restore):
+        super().__init__(parent)
+        self.db = db
+        self.resume_id = resume_id
+        self.on_restore = on_restore
+        self.numbers = []       # revision number per listbox row
+        self.has_more = False
+
+        self.title(f"Resume #{resume_id} - History")
+        self.geometry("820x520")
+        self.configure(bg=COLORS['card_bg'])
+
+        body = tk.Frame(self, bg=COLORS['card_bg'])
+        body.pack(fill="both", expand=True, padx=20, pady=(20, 10))
+
+        self.listbox = tk.Listbox(
+            body,
+            width=28,
+            font=("Segoe UI", 10),
+            bg='#1E293B',
+            fg=COLORS['text_color'],
+            selectbackground=COLORS['accent_color'],
+            relief="flat",
+            activestyle="none",
+            exportselection=False
+        )
+        self.listbox.pack(side="left", fill="y", padx=(0, 12))
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+
+        self.diff_text = scrolledtext.ScrolledText(
+            body,
+            font=("Consolas", 10),
+            bg='#1E293B',
+            fg=COLORS['text_color'],
+            relief="flat",
+            wrap="none"
+        )
+        self.diff_text.pack(side="left", fill="both", expand=True)
+        self.diff_text.tag_configure("added", foreground=COLORS['mint'])
+        self.diff_text.tag_configure("removed", foreground=COLORS['coral'])
+        self.diff_text.tag_configure("header", foreground=COLORS['lavender'])
+
+        buttons = tk.Frame(self, bg=COLORS['card_bg'])
+        buttons.pack(fill="x", padx=20, pady=(0, 20))
+
+        restore_btn = ModernButton(
+            buttons,
+            "Restore to Form",
+            self.restore_selected,
+            bg_color=COLORS['accent_color'],
+            hover_color=COLORS['accent_hover'],
+            width=160,
+            height=38
+        )
+        restore_btn.pack(side="left")
+
+        self.load_page()
+        if self.numbers:
+            self.listbox.selection_set(0)
+            self.show_diff(self.numbers[0])
+
+    def load_page(self):
+        before = self.numbers[-1] if self.numbers else None
+        page_size = DATABASE_CONFIG['page_size']
+        rows = self.db.list_revisions(self.resume_id, page_size + 1, before)
+        self.has_more = len(rows) > page_size
+
+        if self.numbers and self.listbox.get(tk.END) == self.MORE:
+            self.listbox.delete(tk.END)
+        for number, kind, created_at in rows[:page_size]:
+            created_at = (created_at or '')[:16].replace('T', ' ')
+            self.listbox.insert(tk.END, f"#{number}  {created_at}")
+            self.numbers.append(number)
+        if self.has_more:
+            self.listbox.insert(tk.END, self.MORE)
+
+    def selected_number(self):
+        selection = self.listbox.curselection()
+        if not selection or selection[0] >= len(self.numbers):
+            return None
+        return self.numbers[selection[0]]
+
+    def on_select(self, e):
+        selection = self.listbox.curselection()
+        if selection and selection[0] == len(self.numbers) and self.has_more:
+            self.load_page()
+            return
+        number = self.selected_number()
+        if number is not None:
+            self.show_diff(number)
+
+    def show_diff(self, number):
+        diff = self.db.revision_diff(self.resume_id, number) or "No changes"
+
+        self.diff_text.delete("1.0", tk.END)
+        for line in diff.split('\n'):
+            if line.startswith(('---', '+++', '@@')):
+                tag = "header"
+            elif line.startswith('+'):
+                tag = "added"
+            elif line.startswith('-'):
+                tag = "removed"
+            else:
+                tag = None
+            self.diff_text.insert(tk.END, line + '\n', tag)
+
+    def restore_selected(self):
+        number = self.selected_number()
+        if number is None:
+            messagebox.showinfo("💭 Hey!", "Pick a revision first! ✨", parent=self)
+            return
+        data = self.db.load_revision(self.resume_id, number)
+        if data is None:
+            messagebox.showwarning("😢 Not Found", "Couldn't find that revision...", parent=self)
+            return
+        self.on_restore(data)
+        self.destroy()
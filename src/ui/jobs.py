@@ -0,0 +1,129 @@
+"""
+Background jobs for the Tkinter UI
+
+Tk widgets may only be touched from the main thread, so workers never
+call into the UI. They emit events into a shared queue and the main loop
+drains it with root.after polling, dispatching each event to the job's
+handler.
+"""
+import itertools
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """Handle passed to a worker so it can report back and see cancellation"""
+
+    def __init__(self, job_id, kind, events):
+        self.id = job_id
+        self.kind = kind
+        self.events = events
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def emit(self, kind, payload=None):
+        """Send an event to the main loop (safe from any thread)"""
+        self.events.put((self.id, kind, payload))
+
+    def progress(self, message):
+        self.emit('progress', message)
+
+
+class JobQueue:
+    """Runs work on daemon threads and delivers their events on the Tk main loop"""
+
+    # events that finish a job
+    FINAL_EVENTS = ('done', 'error', 'cancelled')
+
+    def __init__(self, root, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.events = queue.Queue()
+        self.jobs = {}
+        self.handlers = {}
+        self.ids = itertools.count(1)
+        self.polling = False
+
+    def submit(self, kind, work, handler):
+        """
+        Start a background job
+
+        work: callable taking the Job; its return value is sent as 'done'
+        handler: called on the main thread as handler(event_kind, payload)
+
+        Returns:
+            Job: handle that can be used to cancel the job
+        """
+        job = Job(next(self.ids), kind, self.events)
+        self.jobs[job.id] = job
+        self.handlers[job.id] = handler
+
+        def run():
+            try:
+                result = work(job)
+                if job.cancelled:
+                    job.emit('cancelled')
+                else:
+                    job.emit('done', result)
+            except Exception as e:
+                job.emit('error', str(e))
+
+        threading.Thread(target=run, daemon=True).start()
+        self.start_polling()
+        return job
+
+    def cancel(self, job):
+        """Cancel a job - its remaining events are dropped"""
+        job.cancel()
+        self.jobs.pop(job.id, None)
+        self.handlers.pop(job.id, None)
+
+    def cancel_kind(self, kind):
+        """Cancel every in-flight job of one kind"""
+        for job in list(self.jobs.values()):
+            if job.kind == kind:
+                self.cancel(job)
+
+    def active(self, kind=None):
+        """In-flight jobs, optionally only of one kind"""
+        return [job for job in self.jobs.values() if kind is None or job.kind == kind]
+
+    def start_polling(self):
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_ms, self.poll)
+
+    def poll(self):
+        """Drain queued events on the main thread"""
+        try:
+            while True:
+                job_id, kind, payload = self.events.get_nowait()
+                handler = self.handlers.get(job_id)
+                if handler is None:
+                    # stale or cancelled job
+                    continue
+
+                if kind in self.FINAL_EVENTS:
+                    self.jobs.pop(job_id, None)
+                    self.handlers.pop(job_id, None)
+                try:
+                    handler(kind, payload)
+                except Exception:
+                    # one broken handler mustn't stop events for every other job
+                    logger.exception("Handler for job %s failed on '%s' event", job_id, kind)
+        except queue.Empty:
+            pass
+        finally:
+            if self.jobs:
+                self.root.after(self.poll_ms, self.poll)
+            else:
+                self.polling = False
@@ -3,13 +3,17 @@ Main Application UI
 """
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog, simpledialog
-import threading
 
-from src.config import COLORS, WINDOW_CONFIG
-from src.ui.widgets import ModernButton
-from src.engine import ResumeEngine, AI_AVAILABLE
+from src.config import COLORS, WINDOW_CONFIG, AI_CONFIG, SERVER_CONFIG, LAYOUT_CONFIG, DATABASE_CONFIG
+from src.ui.widgets import ModernButton, LazyCombobox
+from src.ui.jobs import JobQueue
+from src.ui.history import HistoryWindow
+from src.engine import ResumeEngine
+from src.client import GenerationClient
+from src.cancellation import CancelToken
 from src.pdf_exporter import PDFExporter
 from src.database import ResumeDatabase
+from src.layouts import LAYOUTS
 
 
 class ResumeGeneratorApp:
@@ -21,10 +25,25 @@ class ResumeGeneratorApp:
         self.root.geometry(f"{WINDOW_CONFIG['width']}x{WINDOW_CONFIG['height']}")
         self.root.configure(bg=COLORS['bg_gradient_start'])
 
-        self.engine = ResumeEngine()
+        # use the shared generation server if one is configured
+        if SERVER_CONFIG['url']:
+            self.engine = GenerationClient(SERVER_CONFIG['url'])
+        else:
+            self.engine = ResumeEngine()
         self.db = ResumeDatabase()
+        # the saved resume the form was loaded from, saves become its revisions
+        self.current_resume_id = None
+        self.current_resume_name = None
+        # background work reports back through this, never touching widgets itself
+        self.jobs = JobQueue(self.root)
+        self.cancel_token = None
+        # AI sections of the running generation that used templates
+        self.generate_fallbacks = 0
         self.setup_ui()
 
+        if self.engine.ai_enabled and AI_CONFIG.get('warmup_on_startup'):
+            self.start_ai_warmup()
+
     def setup_ui(self):
         """Setup main user interface"""
         self.root.columnconfigure(0, weight=1)
@@ -89,7 +108,19 @@ class ResumeGeneratorApp:
             width=220,
             height=50
         )
-        self.generate_btn.pack()
+        self.generate_btn.pack(side="left", padx=(0, 10))
+
+        # Stop button - remaining AI sections fall back to templates
+        self.stop_btn = ModernButton(
+            button_frame,
+            "Stop",
+            self.stop_generation,
+            bg_color=COLORS['coral'],
+            hover_color=COLORS['error'],
+            width=90,
+            height=50
+        )
+        self.stop_btn.pack(side="left")
 
         # Output section
         self.create_output_section(main_frame)
@@ -156,12 +187,13 @@ class ResumeGeneratorApp:
         )
         template_rb.pack(side="left", padx=10)
 
-        if AI_AVAILABLE:
+        if self.engine.ai_enabled:
             ai_rb = tk.Radiobutton(
                 mode_options,
                 text="🤖 AI Mode (Premium Quality)",
                 variable=self.mode_var,
                 value="ai",
+                command=self.start_ai_warmup,
                 font=("Segoe UI", 11),
                 fg=COLORS['text_color'],
                 bg=COLORS['card_bg'],
@@ -180,6 +212,57 @@ class ResumeGeneratorApp:
             )
             info_label.pack(side="left", padx=10)
 
+        # text layout of the generated resume
+        layout_row = tk.Frame(mode_inner, bg=COLORS['card_bg'])
+        layout_row.pack(fill="x", pady=(10, 0))
+
+        layout_label = tk.Label(
+            layout_row,
+            text="Layout:",
+            font=("Segoe UI", 11),
+            fg=COLORS['text_color'],
+            bg=COLORS['card_bg']
+        )
+        layout_label.pack(side="left", padx=10)
+
+        self.layout_var = tk.StringVar(value=LAYOUT_CONFIG['default'])
+        layout_box = ttk.Combobox(
+            layout_row,
+            textvariable=self.layout_var,
+            values=sorted(LAYOUTS),
+            state="readonly",
+            width=14
+        )
+        layout_box.pack(side="left")
+
+    def start_ai_warmup(self):
+        """Preload the AI model in the background and show its progress"""
+        if self.jobs.active('warmup'):
+            return
+
+        def warmup_work(job):
+            # checked here, not on the main thread - a remote engine asks its server
+            if self.engine.model_loaded:
+                return None
+            return self.engine.warm_up(progress=job.progress)
+
+        self.jobs.submit('warmup', warmup_work, self.on_warmup_event)
+
+    def on_warmup_event(self, kind, payload):
+        """Show warm-up progress unless a resume is being generated"""
+        if self.jobs.active('generate'):
+            return
+        if kind == 'done' and payload is None:
+            # model was already loaded, leave the status alone
+            return
+
+        if kind == 'progress':
+            self.status_label.config(text=f"⏳ {payload}", fg=COLORS['text_secondary'])
+        elif kind == 'done' and payload:
+            self.status_label.config(text="● AI model ready", fg=COLORS['success'])
+        else:
+            self.status_label.config(text="● Ready to generate (AI model unavailable)", fg=COLORS['error'])
+
     def create_save_load_section(self, parent):
         """Create save/load section with girly aesthetic"""
         save_load_card = tk.Frame(parent, bg=COLORS['card_bg'], bd=0)
@@ -236,7 +319,19 @@ class ResumeGeneratorApp:
             width=100,
             height=38
         )
-        refresh_btn.pack(side="left")
+        refresh_btn.pack(side="left", padx=(0, 10))
+
+        # History button
+        history_btn = ModernButton(
+            button_row,
+            "History",
+            self.open_history,
+            bg_color=COLORS['coral'],
+            hover_color="#F87171",
+            width=100,
+            height=38
+        )
+        history_btn.pack(side="left")
 
         # Dropdown section
         dropdown_frame = tk.Frame(save_load_inner, bg=COLORS['card_bg'])
@@ -260,10 +355,14 @@ class ResumeGeneratorApp:
                        background='#E879F9',
                        foreground='white')
 
-        self.resume_dropdown = ttk.Combobox(
+        # type to filter, rows are fetched a page at a time
+        self.resume_dropdown = LazyCombobox(
             dropdown_frame,
+            lambda after, text, limit: self.db.list_resumes(limit, after, text),
+            self.format_list_row,
+            self.db.page_cursor,
+            page_size=DATABASE_CONFIG['page_size'],
             textvariable=self.resume_var,
-            state="readonly",
             width=45,
             font=("Segoe UI", 10),
             style='Pink.TCombobox'
@@ -273,6 +372,49 @@ class ResumeGeneratorApp:
         # load saved resumes
         self.refresh_resume_list()
 
+        # Search section - full-text over saved and generated resumes
+        search_frame = tk.Frame(save_load_inner, bg=COLORS['card_bg'])
+        search_frame.pack(fill="x", pady=(12, 0))
+
+        search_label = tk.Label(
+            search_frame,
+            text="🔍 Search by name, skill or employer:",
+            font=("Segoe UI", 10),
+            fg=COLORS['coral'],
+            bg=COLORS['card_bg']
+        )
+        search_label.pack(anchor="w", pady=(0, 6))
+
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(
+            search_frame,
+            textvariable=self.search_var,
+            font=("Segoe UI", 10),
+            bg='#1E293B',
+            fg=COLORS['text_color'],
+            insertbackground=COLORS['text_color'],
+            relief="flat"
+        )
+        self.search_entry.pack(fill="x", ipady=4)
+        self.search_entry.bind("<KeyRelease>", self.on_search_key)
+        self.search_entry.bind("<Return>", lambda e: self.run_search())
+
+        self.search_results = []     # (kind, id) per listbox row
+        self.search_pending = None
+        self.search_listbox = tk.Listbox(
+            search_frame,
+            height=6,
+            font=("Segoe UI", 9),
+            bg='#1E293B',
+            fg=COLORS['text_color'],
+            selectbackground=COLORS['accent_color'],
+            relief="flat",
+            activestyle="none"
+        )
+        self.search_listbox.pack(fill="x", pady=(6, 0))
+        self.search_listbox.bind("<Double-Button-1>", lambda e: self.open_search_result())
+        self.search_listbox.bind("<Return>", lambda e: self.open_search_result())
+
     def create_input_section(self, parent):
         """Create input fields section"""
         input_card = tk.Frame(parent, bg=COLORS['card_bg'])
@@ -429,10 +571,13 @@ class ResumeGeneratorApp:
         load_label.pack(side="left", padx=(0, 8))
 
         self.generated_var = tk.StringVar()
-        self.generated_dropdown = ttk.Combobox(
+        self.generated_dropdown = LazyCombobox(
             load_frame,
+            lambda after, text, limit: self.db.list_generated_resumes(limit, after, text),
+            self.format_list_row,
+            self.db.page_cursor,
+            page_size=DATABASE_CONFIG['page_size'],
             textvariable=self.generated_var,
-            state="readonly",
             width=35,
             font=("Segoe UI", 10)
         )
@@ -493,9 +638,14 @@ class ResumeGeneratorApp:
             messagebox.showwarning("⚠️ Missing Information", "Please enter your name.")
             return
 
+        # a new click replaces any generation still running
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+        self.jobs.cancel_kind('generate')
+
         # Update status
         self.status_label.config(text="⏳ Generating resume...", fg="#F59E0B")
-        self.generate_btn.config(state='disabled')
+        self.generate_fallbacks = 0
 
         data = {
             'name': name,
@@ -507,23 +657,57 @@ class ResumeGeneratorApp:
         }
 
         mode = self.mode_var.get()
+        layout = self.layout_var.get()
 
-        def generate_thread():
-            try:
-                resume_text = self.engine.generate_resume(data, mode)
+        # the worker streams chunks as events, the main loop appends them
+        self.output_text.delete("1.0", tk.END)
 
-                self.output_text.delete("1.0", tk.END)
-                self.output_text.insert("1.0", resume_text)
+        # bounds the AI sections once the model is loaded, Stop cancels it early
+        cancel_token = CancelToken(timeout=AI_CONFIG.get('deadline_seconds'), start=False)
+        self.cancel_token = cancel_token
 
-                self.status_label.config(text="✅ Resume generated successfully!", fg=COLORS['success'])
-            except Exception as e:
-                messagebox.showerror("❌ Error", f"Failed to generate resume: {str(e)}")
-                self.status_label.config(text="❌ Generation failed", fg=COLORS['error'])
-            finally:
-                self.generate_btn.config(state='normal')
+        def generate_work(job):
+            chunks = self.engine.stream_resume(
+                data, mode, progress=job.progress, cancel_token=cancel_token, layout=layout
+            )
+            for chunk in chunks:
+                if job.cancelled:
+                    return
+                job.emit('chunk', chunk)
+            # read on the worker thread, the engine counts per thread
+            job.emit('fallbacks', self.engine.last_fallbacks)
+
+        self.jobs.submit('generate', generate_work, self.on_generate_event)
+
+    def stop_generation(self):
+        """Stop AI generation - sections not done yet use templates"""
+        if self.cancel_token is None or not self.jobs.active('generate'):
+            return
 
-        thread = threading.Thread(target=generate_thread, daemon=True)
-        thread.start()
+        self.cancel_token.cancel()
+        self.status_label.config(text="⏳ Stopping - finishing with templates...", fg="#F59E0B")
+
+    def on_generate_event(self, kind, payload):
+        """Apply a generation event on the main thread"""
+        if kind == 'chunk':
+            self.output_text.insert(tk.END, payload)
+            self.output_text.see(tk.END)
+        elif kind == 'progress':
+            self.status_label.config(text=f"⏳ {payload}", fg="#F59E0B")
+        elif kind == 'fallbacks':
+            self.generate_fallbacks = payload
+        elif kind == 'done':
+            if self.generate_fallbacks:
+                count = self.generate_fallbacks
+                self.status_label.config(
+                    text=f"⚠️ Resume generated - {count} AI section{'s' if count != 1 else ''} used templates",
+                    fg="#F59E0B"
+                )
+            else:
+                self.status_label.config(text="✅ Resume generated successfully!", fg=COLORS['success'])
+        elif kind == 'error':
+            self.status_label.config(text="❌ Generation failed", fg=COLORS['error'])
+            messagebox.showerror("❌ Error", f"Failed to generate resume: {payload}")
 
     def save_to_pdf(self):
         """Save resume to PDF file"""
@@ -571,10 +755,19 @@ class ResumeGeneratorApp:
             'experience': experience,
         }
 
+        # an edit of the loaded resume becomes its next revision,
+        # a different name starts a new resume
+        edit_of = self.current_resume_id if name == self.current_resume_name else None
+
         try:
-            resume_id = self.db.save_resume(data)
+            resume_id = self.db.save_resume(data, edit_of)
+            self.current_resume_id = resume_id
+            self.current_resume_name = name
             print(f"Saved resume #{resume_id}")
-            messagebox.showinfo("💖 Saved!", f"Your resume has been saved! ✨\n\nResume ID: #{resume_id}")
+            if edit_of:
+                messagebox.showinfo("💖 Saved!", f"Saved a new revision of resume #{resume_id}! ✨\n\nSee History for earlier versions.")
+            else:
+                messagebox.showinfo("💖 Saved!", f"Your resume has been saved! ✨\n\nResume ID: #{resume_id}")
             self.refresh_resume_list()
             self.status_label.config(text="💝 Resume saved to database!", fg="#E879F9")
         except Exception as e:
@@ -595,28 +788,17 @@ class ResumeGeneratorApp:
             messagebox.showerror("😕 Hmm...", "Something went wrong with your selection!")
             return
 
+        self.load_resume_by_id(resume_id)
+
+    def load_resume_by_id(self, resume_id):
+        """Fill the form from a saved resume"""
         try:
             data = self.db.load_resume(resume_id)
 
             if data:
-                # fill all the form fields
-                self.name_entry.delete(0, tk.END)
-                self.name_entry.insert(0, data['name'])
-
-                self.email_entry.delete(0, tk.END)
-                self.email_entry.insert(0, data['email'])
-
-                self.phone_entry.delete(0, tk.END)
-                self.phone_entry.insert(0, data['phone'])
-
-                self.education_text.delete("1.0", tk.END)
-                self.education_text.insert("1.0", data['education'])
-
-                self.skills_text.delete("1.0", tk.END)
-                self.skills_text.insert("1.0", data['skills'])
-
-                self.experience_text.delete("1.0", tk.END)
-                self.experience_text.insert("1.0", data['experience'])
+                self.fill_form(data)
+                self.current_resume_id = resume_id
+                self.current_resume_name = data['name']
 
                 self.status_label.config(text=f"✨ Loaded resume #{resume_id}!", fg="#A78BFA")
                 messagebox.showinfo("🎉 Loaded!", f"Your resume is ready to edit! 💜")
@@ -625,22 +807,68 @@ class ResumeGeneratorApp:
         except Exception as e:
             messagebox.showerror("😢 Oops!", f"Failed to load resume: {str(e)}")
 
-    def refresh_resume_list(self):
-        """Refresh the dropdown list of saved resumes"""
+    def fill_form(self, data):
+        """Put resume fields into the input form"""
+        self.name_entry.delete(0, tk.END)
+        self.name_entry.insert(0, data['name'])
+
+        self.email_entry.delete(0, tk.END)
+        self.email_entry.insert(0, data['email'])
+
+        self.phone_entry.delete(0, tk.END)
+        self.phone_entry.insert(0, data['phone'])
+
+        self.education_text.delete("1.0", tk.END)
+        self.education_text.insert("1.0", data['education'])
+
+        self.skills_text.delete("1.0", tk.END)
+        self.skills_text.insert("1.0", data['skills'])
+
+        self.experience_text.delete("1.0", tk.END)
+        self.experience_text.insert("1.0", data['experience'])
+
+    def open_history(self):
+        """Show the revision history of the loaded resume (or the selected one)"""
+        # the dropdown may point elsewhere after loading from search or a save
+        resume_id = self.current_resume_id
+        if resume_id is None:
+            try:
+                resume_id = int(self.resume_var.get().split(':')[0].strip())
+            except ValueError:
+                pass
+
+        if resume_id is None:
+            messagebox.showinfo("💭 Hey!", "Select or load a saved resume first! ✨")
+            return
+
         try:
-            resumes = self.db.get_all_resumes()
+            HistoryWindow(self.root, self.db, resume_id, lambda data: self.restore_revision(resume_id, data))
+        except Exception as e:
+            messagebox.showerror("😢 Oops!", f"Couldn't open the history: {str(e)}")
+
+    def restore_revision(self, resume_id, data):
+        """Put an old revision in the form, saving it makes it the newest revision"""
+        self.fill_form(data)
+        self.current_resume_id = resume_id
+        self.current_resume_name = data['name']
+        self.status_label.config(
+            text=f"🕘 Revision #{data['revision']} of resume #{resume_id} restored - save to keep it",
+            fg="#A78BFA"
+        )
 
-            # format as "ID: Name (Date)"
-            resume_list = []
-            for resume in resumes:
-                resume_id = resume[0]
-                name = resume[1]
-                updated_at = resume[2][:10] if len(resume[2]) >= 10 else resume[2]  # just the date part
-                resume_list.append(f"{resume_id}: {name} ({updated_at})")
+    @staticmethod
+    def format_list_row(row):
+        """Format a listing row as "ID: Name (Date)" """
+        row_id, label, timestamp = row
+        timestamp = timestamp or ''
+        return f"{row_id}: {label} ({timestamp[:10]})"  # just the date part
 
-            self.resume_dropdown['values'] = resume_list
+    def refresh_resume_list(self):
+        """Refresh the dropdown list of saved resumes, first page only"""
+        try:
+            self.resume_dropdown.refresh()
 
-            if resume_list:
+            if self.resume_dropdown.entries:
                 self.resume_dropdown.current(0)
         except Exception as e:
             print(f"Failed to refresh resume list: {str(e)}")
@@ -688,6 +916,10 @@ class ResumeGeneratorApp:
             messagebox.showerror("😕 Hmm...", "Something went wrong with your selection!")
             return
 
+        self.load_generated_by_id(resume_id)
+
+    def load_generated_by_id(self, resume_id):
+        """Show a saved generated resume in the output area"""
         try:
             data = self.db.load_generated_resume(resume_id)
 
@@ -705,22 +937,56 @@ class ResumeGeneratorApp:
             messagebox.showerror("😢 Oops!", f"Failed to load: {str(e)}")
 
     def refresh_generated_list(self):
-        """Refresh the dropdown of generated resumes"""
+        """Refresh the dropdown of generated resumes, first page only"""
         try:
-            resumes = self.db.get_all_generated_resumes()
-
-            # format as "ID: Title (Date)"
-            resume_list = []
-            for resume in resumes:
-                resume_id = resume[0]
-                title = resume[1]
-                created_at = resume[2][:10] if len(resume[2]) >= 10 else resume[2]
-                resume_list.append(f"{resume_id}: {title} ({created_at})")
+            self.generated_dropdown.refresh()
 
-            self.generated_dropdown['values'] = resume_list
-
-            if resume_list:
+            if self.generated_dropdown.entries:
                 self.generated_dropdown.current(0)
         except Exception as e:
             print(f"Failed to refresh generated list: {str(e)}")
 
+    def on_search_key(self, e):
+        # wait for a pause in typing before searching
+        if self.search_pending:
+            self.root.after_cancel(self.search_pending)
+        self.search_pending = self.root.after(250, self.run_search)
+
+    def run_search(self):
+        """Search saved and generated resumes for the text in the search box"""
+        self.search_pending = None
+        query = self.search_var.get().strip()
+
+        self.search_listbox.delete(0, tk.END)
+        self.search_results = []
+        if not query:
+            return
+
+        try:
+            limit = DATABASE_CONFIG['page_size']
+            resumes = self.db.search_resumes(query, limit)
+            generated = self.db.search_generated_resumes(query, limit)
+        except Exception as e:
+            print(f"Search failed: {str(e)}")
+            return
+
+        for kind, label, rows in (('resume', "📝", resumes), ('generated', "📄", generated)):
+            for row_id, title, _, snippet in rows:
+                snippet = ' '.join(snippet.split())   # keep it on one line
+                self.search_listbox.insert(tk.END, f"{label} #{row_id} {title} — {snippet}")
+                self.search_results.append((kind, row_id))
+
+        if not self.search_results:
+            self.search_listbox.insert(tk.END, "No matches")
+
+    def open_search_result(self):
+        """Load the selected search result into the form or the output area"""
+        selection = self.search_listbox.curselection()
+        if not selection or selection[0] >= len(self.search_results):
+            return
+
+        kind, row_id = self.search_results[selection[0]]
+        if kind == 'resume':
+            self.load_resume_by_id(row_id)
+        else:
+            self.load_generated_by_id(row_id)
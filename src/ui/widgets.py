@@ -2,6 +2,7 @@
 Modern Custom Widgets for AI Resume Generator
 """
 import tkinter as tk
+from tkinter import ttk
 
 
 class ModernButton(tk.Canvas):
@@ -60,3 +61,71 @@ class ModernButton(tk.Canvas):
         if self.command:
             self.command()
 
+
+class LazyCombobox(ttk.Combobox):
+    """
+    Combobox that fetches its entries a page at a time
+
+    fetch_page(after, text, limit) returns up to limit rows after the
+    cursor, filtered on text; format_row turns a row into an entry and
+    cursor_for turns the last row of a page into the next cursor. Typing
+    filters the list (after a short pause), and picking the last entry
+    loads the next page.
+    """
+    MORE = "⋯ more"
+
+    def __init__(self, parent, fetch_page, format_row, cursor_for, page_size=50, delay_ms=250, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.fetch_page = fetch_page
+        self.format_row = format_row
+        self.cursor_for = cursor_for
+        self.page_size = page_size
+        self.delay_ms = delay_ms
+
+        self.entries = []
+        self.cursor = None
+        self.has_more = False
+        self.filter_text = ''
+        self.pending = None
+
+        self.bind("<KeyRelease>", self.on_key)
+        self.bind("<<ComboboxSelected>>", self.on_selected)
+
+    def refresh(self, text=''):
+        """Start over from the first page"""
+        self.filter_text = text
+        self.entries = []
+        self.cursor = None
+        self.load_page()
+
+    def load_page(self):
+        # one extra row tells us whether there's another page
+        rows = self.fetch_page(self.cursor, self.filter_text, self.page_size + 1)
+        self.has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if rows:
+            self.cursor = self.cursor_for(rows[-1])
+        self.entries.extend(self.format_row(row) for row in rows)
+        self['values'] = self.entries + ([self.MORE] if self.has_more else [])
+
+    def on_key(self, e):
+        # only keys that change the text, not arrows, modifiers or Return
+        if not (e.char and e.char.isprintable()) and e.keysym not in ("BackSpace", "Delete"):
+            return
+        if self.pending:
+            self.after_cancel(self.pending)
+        self.pending = self.after(self.delay_ms, self.apply_filter)
+
+    def apply_filter(self):
+        self.pending = None
+        text = self.get().strip()
+        if text != self.filter_text:
+            self.refresh(text)
+            self.event_generate("<Down>")   # show the matches
+
+    def on_selected(self, e):
+        if self.get() != self.MORE:
+            return
+        self.set(self.filter_text)
+        self.load_page()
+        self.after_idle(lambda: self.event_generate("<Down>"))